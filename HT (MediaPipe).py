@@ -1,7 +1,5 @@
 import cv2
-import mediapipe as mp
 import numpy as np
-import json
 import tkinter as tk
 from tkinter import ttk
 from textblob import TextBlob
@@ -9,15 +7,23 @@ import threading
 import time
 import queue
 from PIL import Image, ImageTk
-
-# Initialize MediaPipe Hands
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5)
-mp_drawing = mp.solutions.drawing_utils
-
-# Load gesture definitions from JSON (if you want to keep gesture matching)
-with open('gestures.json', 'r') as f:
-    gestures = json.load(f)  # e.g., {"hello": [x1, y1, z1, ...], ...}
+from hand_tracker import HandTracker
+from motion_gate import MotionGate
+from landmark_flow import LandmarkFlow
+from capture import LatestFrameCapture
+from quality import QualityController
+from frame_pipeline import FramePipeline
+from hand_frames import HandFrameRing
+from overlay import LandmarkOverlay
+from vision_worker import VisionWorker
+from gesture_library import GestureLibrary
+from sign_debounce import SignDebouncer
+
+# Run capture and hand inference in a separate process (see vision_worker.py)
+USE_VISION_WORKER = False
+
+# tracker, quality, overlay and gestures are created under __main__ below:
+# the vision worker process re-imports this script and must not build them
 
 # Mapping from recognized speech to sign videos
 speech_to_sign_video_map = {
@@ -56,7 +62,10 @@ class SignToTextApp:
         # Threading and state
         self.sign_thread = None
         self.running = False
-        self.last_match_time = 0
+        # Recent hand frames as (hands, 21, 3) arrays for temporal features
+        self.hand_history = HandFrameRing(capacity=64, max_hands=2)
+        # Turns per-frame matches into one event per held sign
+        self.debouncer = SignDebouncer()
 
         # Start processing GUI queue
         self.root.after(100, self.process_gui_queue)
@@ -77,7 +86,8 @@ class SignToTextApp:
         self.running = True
         self.start_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
-        self.sign_thread = threading.Thread(target=self.sign_input_loop, daemon=True)
+        loop = self.worker_input_loop if USE_VISION_WORKER else self.sign_input_loop
+        self.sign_thread = threading.Thread(target=loop, daemon=True)
         self.sign_thread.start()
 
     def stop_sign_input(self):
@@ -88,43 +98,78 @@ class SignToTextApp:
     def sign_input_loop(self):
         cap = None
         try:
-            cap = cv2.VideoCapture(0)
+            cap = LatestFrameCapture(0).start()
+            pipeline = FramePipeline()
             while self.running and cap.isOpened():
                 ret, frame = cap.read()
                 if not ret:
                     break
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = hands.process(rgb_frame)
-                display_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
-
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        mp_drawing.draw_landmarks(display_frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                        landmarks = []
-                        for lm in hand_landmarks.landmark:
-                            landmarks.extend([lm.x, lm.y, lm.z])
-                        current_time = time.time()
-                        if current_time - self.last_match_time > 1.0:
-                            # You can enable gesture matching here if needed
-                            # matched_gesture = self.match_gesture(np.array(landmarks))
-                            # if matched_gesture and matched_gesture != "Unknown Gesture":
-                            #     corrected = str(TextBlob(matched_gesture).correct())
-                            #     self.gui_queue.put({'type': 'update_text', 'text': f"Recognized: {corrected}\n"})
-                            #     self.last_match_time = current_time
-                            pass
+                quality.begin_frame()
+                # Single conversion into a reused buffer, shared by
+                # inference, the overlay and the Tk image
+                rgb_frame = pipeline.to_rgb(frame)
+                with quality.stage('inference'):
+                    multi_hand_landmarks = tracker.process(rgb_frame)
+
+                hand_frame = self.hand_history.push(multi_hand_landmarks, tracker.handedness())
+                observations = {}
+                if hand_frame.count:
+                    overlay.draw(rgb_frame, hand_frame.points)
+                    # You can enable gesture matching here if needed
+                    # observations = gestures.matcher.match_frame_by_hand(hand_frame.points, hand_frame.handedness)
+                for matched_gesture in self.debouncer.update(observations):
+                    corrected = str(TextBlob(matched_gesture).correct())
+                    self.gui_queue.put({'type': 'update_text', 'text': f"Recognized: {corrected}\n"})
 
                 # Convert frame for Tkinter display
-                im = Image.fromarray(cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB))
-                imgtk = ImageTk.PhotoImage(image=im)
-                self.gui_queue.put({'type': 'video_frame', 'image': imgtk})
+                with quality.stage('display'):
+                    im = Image.fromarray(rgb_frame)
+                    imgtk = ImageTk.PhotoImage(image=im)
+                    self.gui_queue.put({'type': 'video_frame', 'image': imgtk})
+                quality.end_frame()
 
-                time.sleep(0.03)  # ~30 fps
+                time.sleep(quality.delay)  # paced by the quality controller
         except Exception as e:
             print(f"Error in sign_input_loop: {e}")
         finally:
             if cap:
                 cap.release()
 
+    def worker_input_loop(self):
+        # Capture and inference happen in the worker process; this thread only
+        # copies the newest frame out of shared memory and displays it
+        worker = VisionWorker(tracker_options=dict(
+            min_detection_confidence=0.5, roi_mode=True, roi_max_side=320,
+            motion_gate=MotionGate(), landmark_flow=LandmarkFlow(keyframe_interval=3)
+        ))
+        pipeline = FramePipeline()
+        try:
+            worker.start()
+            last_seq = 0
+            while self.running and worker.is_alive():
+                latest = worker.read_latest(last_seq)
+                if latest is None:
+                    time.sleep(0.005)
+                    continue
+                last_seq, frame, points = latest
+                rgb_frame = pipeline.to_rgb(frame)
+                points = points.copy()
+                if not worker.still_valid(last_seq):
+                    continue  # slot was reused while we were copying it
+
+                overlay.draw(rgb_frame, points)
+                for event in worker.poll_events():
+                    if event['type'] == 'sign':
+                        self.gui_queue.put({'type': 'update_text', 'text': f"Recognized: {event['label']}\n"})
+
+                im = Image.fromarray(rgb_frame)
+                imgtk = ImageTk.PhotoImage(image=im)
+                self.gui_queue.put({'type': 'video_frame', 'image': imgtk})
+        except Exception as e:
+            print(f"Error in worker_input_loop: {e}")
+        finally:
+            worker.stop()
+
     def handle_recognized_speech(self, recognized_text):
         # Call this method with the recognized speech text
         text = recognized_text.lower().strip()
@@ -146,22 +191,21 @@ class SignToTextApp:
             time.sleep(0.03)
         cap.release()
 
-    # Optional: gesture matching method (disabled here)
-    # def match_gesture(self, detected_landmarks):
-    #     min_distance = float('inf')
-    #     best_match = None
-    #     for gesture, ref_landmarks in gestures.items():
-    #         ref_array = np.array(ref_landmarks)
-    #         if len(ref_array) == len(detected_landmarks):
-    #             distance = np.linalg.norm(detected_landmarks - ref_array)
-    #             if distance < min_distance:
-    #                 min_distance = distance
-    #                 best_match = gesture
-    #     if min_distance < 0.5:
-    #         return best_match
-    #     return "Unknown Gesture"
-
 if __name__ == "__main__":
+    # Initialize MediaPipe Hands
+    # Add backend='tasks', model_asset_path='hand_landmarker.task' to run the
+    # MediaPipe Tasks HandLandmarker asynchronously instead
+    tracker = HandTracker(max_num_hands=2, min_detection_confidence=0.5, roi_mode=True, roi_max_side=320,
+                          motion_gate=MotionGate(), landmark_flow=LandmarkFlow(keyframe_interval=3))
+    quality = QualityController(tracker)
+    # Overlay is drawn on the RGB frame (pass enabled=False to skip drawing)
+    overlay = LandmarkOverlay(rgb=True)
+
+    # Load gesture definitions (if you want to keep gesture matching).
+    # gestures.json, e.g. {"hello": [x1, y1, z1, ...], ...}, is compiled into
+    # gestures.bank and reloaded in the background whenever either file changes
+    gestures = GestureLibrary('gestures.bank', 'gestures.json').start()
+
     root = tk.Tk()
     app = SignToTextApp(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,140 @@
+# ann_index.py
+import argparse
+import time
+import numpy as np
+
+
+def _sq_distances(queries, data, data_sq_norms):
+    d2 = np.einsum('ij,ij->i', queries, queries)[:, None] + data_sq_norms[None, :] - 2.0 * queries @ data.T
+    return np.maximum(d2, 0.0, out=d2)
+
+
+def _top_k(d2, k):
+    # Row-wise k smallest, sorted; returns (indices, squared distances)
+    k = min(k, d2.shape[1])
+    nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+    rows = np.arange(d2.shape[0])[:, None]
+    order = np.argsort(d2[rows, nearest], axis=1)
+    nearest = nearest[rows, order]
+    return nearest, d2[rows, nearest]
+
+
+def exact_search(data, data_sq_norms, queries, k=1):
+    # Brute-force k nearest rows of data for every query: (ids, distances)
+    queries = np.asarray(queries, dtype=np.float32).reshape(-1, data.shape[1])
+    ids, d2 = _top_k(_sq_distances(queries, data, data_sq_norms), k)
+    return ids, np.sqrt(d2)
+
+
+def kmeans(data, k, iterations=20, seed=0, chunk=4096):
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), k, replace=False)].astype(np.float32)
+    assign = np.zeros(len(data), dtype=np.intp)
+    for _ in range(iterations):
+        c_sq = np.einsum('ij,ij->i', centroids, centroids)
+        for start in range(0, len(data), chunk):
+            block = data[start:start + chunk]
+            assign[start:start + chunk] = _sq_distances(block, centroids, c_sq).argmin(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        counts = np.bincount(assign, minlength=k)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        # Restart empty clusters on random points
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = data[rng.choice(len(data), len(empty), replace=False)]
+    return centroids, assign
+
+
+class IVFIndex:
+    # Inverted-file index: a k-means coarse quantizer splits the templates
+    # into n_lists cells, and a query is only compared exactly against the
+    # templates in its n_probe nearest cells. Templates are stored reordered
+    # by cell so every cell is one contiguous slice. Raising n_probe trades
+    # speed for recall; n_probe == n_lists is an exact search.
+    def __init__(self, data, n_lists=None, n_probe=8, iterations=20, seed=0):
+        data = np.asarray(data, dtype=np.float32)
+        n = len(data)
+        if n_lists is None:
+            n_lists = int(np.sqrt(n))
+        self.n_lists = max(1, min(n_lists, n))
+        self.n_probe = n_probe
+        self.centroids, assign = kmeans(data, self.n_lists, iterations, seed)
+        self.centroid_sq_norms = np.einsum('ij,ij->i', self.centroids, self.centroids)
+
+        self.order = np.argsort(assign, kind='stable')  # position -> template id
+        self.data = np.ascontiguousarray(data[self.order])
+        self.sq_norms = np.einsum('ij,ij->i', self.data, self.data)
+        counts = np.bincount(assign, minlength=self.n_lists)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def search(self, queries, k=1, n_probe=None):
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.data.shape[1])
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        cells, _ = _top_k(_sq_distances(queries, self.centroids, self.centroid_sq_norms), n_probe)
+
+        ids = np.full((len(queries), k), -1, dtype=np.intp)
+        dists = np.full((len(queries), k), np.inf, dtype=np.float32)
+        for row, query in enumerate(queries):
+            spans = [(self.offsets[c], self.offsets[c + 1]) for c in cells[row]]
+            candidates = np.concatenate([np.arange(start, end) for start, end in spans])
+            if not len(candidates):
+                continue
+            d2 = _sq_distances(query[None, :], self.data[candidates], self.sq_norms[candidates])
+            nearest, best = _top_k(d2, k)
+            found = nearest.shape[1]
+            ids[row, :found] = self.order[candidates[nearest[0]]]
+            dists[row, :found] = np.sqrt(best[0])
+        return ids, dists
+
+
+def benchmark(data, k=5, n_lists=None, probes=(1, 2, 4, 8, 16), n_queries=1000, noise=0.05, seed=0):
+    # Recall@k and queries/second of IVFIndex against exact search, using
+    # noisy copies of bank templates as queries.
+    rng = np.random.default_rng(seed)
+    data = np.asarray(data, dtype=np.float32)
+    queries = data[rng.integers(0, len(data), n_queries)]
+    queries = queries + rng.normal(0, noise, queries.shape).astype(np.float32)
+    sq_norms = np.einsum('ij,ij->i', data, data)
+
+    start = time.perf_counter()
+    exact_ids = np.concatenate([exact_search(data, sq_norms, q, k)[0] for q in queries])
+    exact_qps = n_queries / (time.perf_counter() - start)
+    print(f"exact: {exact_qps:10.0f} queries/s")
+
+    start = time.perf_counter()
+    index = IVFIndex(data, n_lists=n_lists, seed=seed)
+    print(f"built IVF index with {index.n_lists} lists in {time.perf_counter() - start:.2f}s")
+    for n_probe in probes:
+        if n_probe > index.n_lists:
+            break
+        start = time.perf_counter()
+        ann_ids = np.concatenate([index.search(q, k, n_probe)[0] for q in queries])
+        qps = n_queries / (time.perf_counter() - start)
+        recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(ann_ids, exact_ids)])
+        print(f"n_probe={n_probe:<4d} recall@{k}={recall:.3f} {qps:10.0f} queries/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the IVF gesture index against exact search.")
+    parser.add_argument("--bank", default="gestures.bank", help="compiled gesture bank to search")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="use this many random templates instead of the bank")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--lists", type=int, default=None)
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        # Clusters of prototypes around random sign poses, like a real library
+        rng = np.random.default_rng(0)
+        signs = rng.normal(0, 1, (max(1, args.synthetic // 20), 63))
+        data = (signs[rng.integers(0, len(signs), args.synthetic)]
+                + rng.normal(0, 0.15, (args.synthetic, 63))).astype(np.float32)
+    else:
+        from gesture_bank import load_bank
+        data = load_bank(args.bank).templates
+    print(f"{len(data)} templates")
+    benchmark(data, k=args.k, n_lists=args.lists, probes=args.probes, n_queries=args.queries)
@@ -0,0 +1,167 @@
+# build_prototypes.py
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+
+from hand_frames import LEFT, NUM_LANDMARKS, RIGHT, UNKNOWN, fill_hand_points, normalize_hands
+from hand_tracker import HandTracker
+from landmark_cache import LandmarkCache
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov')
+MAX_HANDS = 2
+# HandTracker settings used for extraction; part of the landmark cache key
+EXTRACTOR_SETTINGS = dict(max_num_hands=MAX_HANDS, model_complexity=1,
+                          min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+
+def find_clips(folder):
+    # Clips are labelled by their sub-folder ("hello/take1.mp4") or, for files
+    # directly in the library folder, by their file name the way
+    # SignVideoPlayer does ("hello.mp4")
+    clips = []
+    for dirpath, _, filenames in os.walk(folder):
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(VIDEO_EXTENSIONS):
+                continue
+            if os.path.abspath(dirpath) == os.path.abspath(folder):
+                label = os.path.splitext(filename)[0].lower()
+            else:
+                label = os.path.basename(dirpath).lower()
+            clips.append((label, os.path.join(dirpath, filename)))
+    return clips
+
+
+def extract_clip(path):
+    # Landmarks for every frame of a clip: (frames, 2, 21, 3) float32 points,
+    # the number of hands found in each frame and the (frames, 2)
+    # LEFT/RIGHT/UNKNOWN handedness of each hand
+    cap = cv2.VideoCapture(path)
+    points, counts, handedness = [], [], []
+    slot = np.zeros((MAX_HANDS, NUM_LANDMARKS, 3), dtype=np.float32)
+    with HandTracker(**EXTRACTOR_SETTINGS) as tracker:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            n = fill_hand_points(slot, tracker.process_bgr(frame))
+            sides = [UNKNOWN] * MAX_HANDS
+            for h, classification in enumerate(tracker.handedness()[:n]):
+                sides[h] = LEFT if classification.label == 'Left' else RIGHT
+            counts.append(n)
+            points.append(slot.copy())
+            handedness.append(sides)
+    cap.release()
+    points = np.array(points, dtype=np.float32).reshape(-1, MAX_HANDS, NUM_LANDMARKS, 3)
+    handedness = np.array(handedness, dtype=np.int8).reshape(-1, MAX_HANDS)
+    return points, np.array(counts, dtype=np.int8), handedness
+
+
+def sign_samples(extracted, frame_step=1):
+    # Normalized pose samples for one sign. A sign counts as two-handed when
+    # most of its frames show two hands; the hands are then ordered by wrist
+    # x so every sample uses the same layout. Otherwise samples come from the
+    # dominant hand, the side seen in the most frames, found in each frame
+    # by its handedness since MediaPipe does not keep hands in fixed slots.
+    points = np.concatenate([p[::frame_step] for p, _, _ in extracted])
+    counts = np.concatenate([c[::frame_step] for _, c, _ in extracted])
+    handedness = np.concatenate([h[::frame_step] for _, _, h in extracted])
+    if np.count_nonzero(counts == 2) > np.count_nonzero(counts == 1):
+        pairs = points[counts == 2]
+        swap = pairs[:, 0, 0, 0] > pairs[:, 1, 0, 0]
+        pairs[swap] = pairs[swap][:, ::-1]
+        return normalize_hands(pairs).reshape(-1, 2 * NUM_LANDMARKS * 3)
+
+    seen = handedness[handedness != UNKNOWN]
+    if not len(seen):
+        # No handedness at all: only frames with a single hand are unambiguous
+        return normalize_hands(points[counts == 1, 0]).reshape(-1, NUM_LANDMARKS * 3)
+    present = handedness == np.bincount(seen, minlength=2).argmax()
+    frames = np.flatnonzero(present.any(axis=1))
+    return normalize_hands(points[frames, present[frames].argmax(axis=1)]).reshape(-1, NUM_LANDMARKS * 3)
+
+
+def k_medoids(samples, k, iterations=20, seed=0):
+    # Voronoi-iteration k-medoids with k-medoids++ seeding; returns the
+    # medoid rows, which are real samples rather than averages
+    n = len(samples)
+    k = min(k, n)
+    sq = np.einsum('ij,ij->i', samples, samples)
+    dist = np.sqrt(np.maximum(sq[:, None] + sq[None, :] - 2.0 * samples @ samples.T, 0))
+
+    rng = np.random.default_rng(seed)
+    medoids = [int(rng.integers(n))]
+    while len(medoids) < k:
+        nearest = dist[:, medoids].min(axis=1) ** 2
+        if nearest.sum() == 0:
+            break
+        medoids.append(int(rng.choice(n, p=nearest / nearest.sum())))
+    medoids = np.array(medoids)
+
+    for _ in range(iterations):
+        assign = dist[:, medoids].argmin(axis=1)
+        updated = medoids.copy()
+        for c in range(len(medoids)):
+            members = np.flatnonzero(assign == c)
+            if len(members):
+                updated[c] = members[dist[np.ix_(members, members)].sum(axis=1).argmin()]
+        if (updated == medoids).all():
+            break
+        medoids = updated
+    return samples[medoids]
+
+
+def build_prototypes(clips, extracted, prototypes=3, frame_step=2, max_samples=1500, seed=0):
+    by_label = {}
+    for (label, _), result in zip(clips, extracted):
+        by_label.setdefault(label, []).append(result)
+
+    rng = np.random.default_rng(seed)
+    library = {}
+    for label, results in sorted(by_label.items()):
+        samples = sign_samples(results, frame_step)
+        if not len(samples):
+            print(f"No hands found for '{label}', skipping")
+            continue
+        if len(samples) > max_samples:
+            samples = samples[rng.choice(len(samples), max_samples, replace=False)]
+        library[label] = np.round(k_medoids(samples, prototypes, seed=seed), 5).tolist()
+    return library
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build compact gesture prototypes from a folder of sign clips.")
+    parser.add_argument("library", nargs="?", default=os.path.join("Research", "Sign library"))
+    parser.add_argument("-o", "--output", default="prototypes.json",
+                        help="gesture file to write (use gestures.json to feed the apps directly)")
+    parser.add_argument("-k", "--prototypes", type=int, default=3, help="prototypes per sign")
+    parser.add_argument("--frame-step", type=int, default=2, help="use every n-th frame as a sample")
+    parser.add_argument("--max-samples", type=int, default=1500, help="samples per sign fed to k-medoids")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--cache-dir", default=".landmark_cache",
+                        help="landmark cache; only new or changed clips are re-extracted")
+    args = parser.parse_args()
+
+    clips = find_clips(args.library)
+    cache = LandmarkCache(args.cache_dir, EXTRACTOR_SETTINGS)
+    extracted = [cache.get(path) for _, path in clips]
+    missing = [i for i, result in enumerate(extracted) if result is None]
+    print(f"{len(clips) - len(missing)} of {len(clips)} clips cached; "
+          f"extracting {len(missing)} with {args.workers} workers...")
+    start = time.perf_counter()
+    if missing:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for i, result in zip(missing, pool.map(extract_clip, [clips[i][1] for i in missing])):
+                extracted[i] = result
+                cache.put(clips[i][1], *result)
+    cache.save_index()
+    print(f"Extraction took {time.perf_counter() - start:.1f}s")
+
+    library = build_prototypes(clips, extracted, args.prototypes, args.frame_step, args.max_samples)
+    with open(args.output, 'w') as f:
+        json.dump(library, f)
+    total = sum(len(p) for p in library.values())
+    print(f"Wrote {total} prototypes for {len(library)} signs to {args.output}")
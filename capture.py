@@ -0,0 +1,78 @@
+# capture.py
+import threading
+import time
+import cv2
+
+
+class LatestFrameCapture:
+    # Reads the camera on its own thread and keeps only the newest frame in a
+    # single slot, so slow inference never works on frames queued in the driver.
+    def __init__(self, source=0):
+        self.cap = cv2.VideoCapture(source)
+        # Ask the driver not to queue frames (ignored by some backends)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.condition = threading.Condition()
+        self.frame = None
+        self.timestamp = 0.0
+        self.read_timestamp = 0.0
+        self.seq = 0            # sequence number of the frame in the slot
+        self.read_seq = 0       # sequence number of the last frame handed out
+        self.frames_dropped = 0 # frames overwritten before anyone read them
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if not self.cap.isOpened():
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def _capture_loop(self):
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            with self.condition:
+                if self.seq > self.read_seq:
+                    self.frames_dropped += 1
+                self.frame = frame
+                self.timestamp = time.time()
+                self.seq += 1
+                self.condition.notify_all()
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+    def isOpened(self):
+        return self.running
+
+    def read(self, timeout=None):
+        # Returns (True, frame) for a frame not seen before, or (False, None)
+        # if the camera stopped or no new frame arrived within the timeout.
+        with self.condition:
+            self.condition.wait_for(lambda: self.seq > self.read_seq or not self.running, timeout)
+            if self.seq <= self.read_seq:
+                return False, None
+            self.read_seq = self.seq
+            self.read_timestamp = self.timestamp
+            return True, self.frame
+
+    def frame_age(self):
+        # Seconds since the last frame handed out was captured
+        return time.time() - self.read_timestamp
+
+    def stats(self):
+        with self.condition:
+            return {
+                'captured': self.seq,
+                'read': self.read_seq,
+                'dropped': self.frames_dropped,
+            }
+
+    def release(self):
+        self.running = False
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.cap.release()
@@ -0,0 +1,151 @@
+# clip_cache.py
+import json
+import os
+import threading
+from collections import Counter, OrderedDict, namedtuple
+import cv2
+import numpy as np
+
+# frames is a (n, height, width, 3) uint8 RGB array, already at display size
+DecodedClip = namedtuple('DecodedClip', ['frames', 'fps'])
+
+
+def clip_fps(cap):
+    return cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+
+def display_frames(cap, size):
+    # Yields display-ready RGB frames of size (w, h) from an open capture
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        # Resize first so the conversion touches fewer pixels
+        yield cv2.cvtColor(cv2.resize(frame, size), cv2.COLOR_BGR2RGB)
+
+
+def decode_clip(path, size):
+    # Decodes a whole clip; None if no frame could be read
+    cap = cv2.VideoCapture(path)
+    fps = clip_fps(cap)
+    frames = list(display_frames(cap, size))
+    cap.release()
+    if not frames:
+        return None
+    return DecodedClip(np.stack(frames), fps)
+
+
+class ClipCache:
+    # LRU cache of decoded clips under a byte budget. Keys are
+    # (word, width, height), so a clip decoded for another display size is a
+    # miss. A clip larger than the whole budget is not cached. Play counts
+    # can be kept in a small JSON file so the most frequent words can be
+    # preloaded in the next session. They are counted in memory and written
+    # by a background timer save_delay seconds after a play, so playing a
+    # clip never waits on the disk; close() writes any unsaved counts.
+    def __init__(self, budget_bytes=256 * 1024 * 1024, usage_path=None, save_delay=5.0):
+        self.budget_bytes = budget_bytes
+        self.usage_path = usage_path
+        self.save_delay = save_delay
+        self.clips = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()  # one writer of usage_path at a time
+        self.save_timer = None
+        self.plays = Counter(self._load_usage())
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _load_usage(self):
+        if not self.usage_path:
+            return {}
+        try:
+            with open(self.usage_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def record_play(self, word):
+        with self.lock:
+            self.plays[word] += 1
+            if self.usage_path and self.save_timer is None:
+                self.save_timer = threading.Timer(self.save_delay, self.save_usage)
+                self.save_timer.daemon = True
+                self.save_timer.start()
+
+    def save_usage(self):
+        with self.lock:
+            self.save_timer = None
+            plays = dict(self.plays)
+        if not self.usage_path:
+            return
+        with self.save_lock:
+            tmp_path = self.usage_path + '.tmp'
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(plays, f)
+                os.replace(tmp_path, self.usage_path)
+            except OSError as e:
+                print(f"Could not save clip usage to {self.usage_path}: {e}")
+
+    def close(self):
+        # Writes the play counts now if a save is still pending
+        with self.lock:
+            timer, self.save_timer = self.save_timer, None
+        if timer is not None:
+            timer.cancel()
+            self.save_usage()
+
+    def most_frequent(self, n):
+        return [word for word, _ in self.plays.most_common(n)]
+
+    def get(self, key):
+        with self.lock:
+            clip = self.clips.get(key)
+            if clip is None:
+                self.misses += 1
+                return None
+            self.clips.move_to_end(key)
+            self.hits += 1
+            return clip
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.clips
+
+    def put(self, key, clip):
+        size = clip.frames.nbytes
+        if size > self.budget_bytes:
+            return False
+        with self.lock:
+            old = self.clips.pop(key, None)
+            if old is not None:
+                self.bytes -= old.frames.nbytes
+            while self.clips and self.bytes + size > self.budget_bytes:
+                _, evicted = self.clips.popitem(last=False)
+                self.bytes -= evicted.frames.nbytes
+                self.evictions += 1
+            self.clips[key] = clip
+            self.bytes += size
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.clips.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'clips': len(self.clips),
+                'mb': self.bytes / (1024 * 1024),
+                'budget_mb': self.budget_bytes / (1024 * 1024),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,177 @@
+# clip_store.py
+import argparse
+import json
+import os
+import shutil
+import struct
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+
+from clip_cache import DecodedClip, clip_fps, display_frames
+
+# Bump when the file layout or the frame format changes
+STORE_VERSION = 1
+MAGIC = b'CLPS'
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov')
+DEFAULT_SIZE = (400, 300)
+
+# magic, version, frame width, frame height, total frames, index offset,
+# index size, frames offset
+HEADER = struct.Struct('<4sIIIQQQQ')
+HEADER_SIZE = 64
+
+
+def library_clips(library):
+    # {word: path} from a folder of clips (named like SignVideoPlayer expects)
+    # or from a videos.json word -> path map
+    if library.lower().endswith('.json'):
+        with open(library, 'r') as f:
+            return {word.lower(): path for word, path in json.load(f).items()}
+    clips = {}
+    for filename in sorted(os.listdir(library)):
+        if filename.lower().endswith(VIDEO_EXTENSIONS):
+            clips[os.path.splitext(filename)[0].lower()] = os.path.join(library, filename)
+    return clips
+
+
+def _source_signatures(clips):
+    sources = {}
+    for word, path in clips.items():
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        sources[word.lower()] = [os.path.abspath(path), st.st_size, st.st_mtime_ns]
+    return sources
+
+
+def transcode_clip(job):
+    # Runs in a worker process: writes the clip's display-ready RGB frames
+    # to a raw file and returns (raw path, frame count, fps)
+    path, size, raw_path = job
+    cap = cv2.VideoCapture(path)
+    fps = clip_fps(cap)
+    count = 0
+    with open(raw_path, 'wb') as f:
+        for frame in display_frames(cap, size):
+            f.write(frame.tobytes())
+            count += 1
+    cap.release()
+    return raw_path, count, fps
+
+
+def compile_store(clips, store_path, size=DEFAULT_SIZE, workers=None):
+    sources = _source_signatures(clips)
+    words = sorted(sources)
+    tmp_dir = tempfile.mkdtemp(prefix='clip_store_')
+    try:
+        jobs = [(clips[word], size, os.path.join(tmp_dir, f"{i}.raw")) for i, word in enumerate(words)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            transcoded = list(pool.map(transcode_clip, jobs))
+
+        # Frames first, then the index, then the real header; write to a
+        # temporary file and rename so readers never see a partial store
+        index = {'sources': sources, 'clips': {}}
+        total = 0
+        tmp_path = store_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(b'\0' * HEADER_SIZE)
+            for word, (raw_path, count, fps) in zip(words, transcoded):
+                if count == 0:
+                    print(f"Could not decode {clips[word]}, skipping")
+                    continue
+                with open(raw_path, 'rb') as raw:
+                    shutil.copyfileobj(raw, f)
+                index['clips'][word] = {'offset': total, 'count': count, 'fps': fps}
+                total += count
+            index_blob = json.dumps(index).encode('utf-8')
+            index_offset = f.tell()
+            f.write(index_blob)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, STORE_VERSION, size[0], size[1], total,
+                                index_offset, len(index_blob), HEADER_SIZE))
+        os.replace(tmp_path, store_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return index
+
+
+class ClipStore:
+    # Every clip of the library as raw display-ready RGB frames in one file.
+    # Frames are read through a single read-only np.memmap, so get() returns
+    # zero-copy slices, opening a clip costs nothing, and processes playing
+    # from the same store share its pages.
+    def __init__(self, store_path):
+        with open(store_path, 'rb') as f:
+            raw = f.read(HEADER_SIZE)
+            header = HEADER.unpack(raw[:HEADER.size]) if len(raw) == HEADER_SIZE else None
+            if header is None or header[0] != MAGIC or header[1] != STORE_VERSION:
+                raise ValueError(f"{store_path} is not a version {STORE_VERSION} clip store")
+            _, _, width, height, total, index_offset, index_size, frames_offset = header
+            f.seek(index_offset)
+            index = json.loads(f.read(index_size).decode('utf-8'))
+        self.path = store_path
+        self.size = (width, height)
+        self.sources = index['sources']
+        self.index = index['clips']
+        self.frames = (np.memmap(store_path, dtype=np.uint8, mode='r', offset=frames_offset,
+                                 shape=(total, height, width, 3))
+                       if total else np.zeros((0, height, width, 3), dtype=np.uint8))
+
+    def get(self, word):
+        entry = self.index.get(word.lower())
+        if entry is None:
+            return None
+        start = entry['offset']
+        return DecodedClip(self.frames[start:start + entry['count']], entry['fps'])
+
+    def is_current(self, clips):
+        return self.sources == _source_signatures(clips)
+
+    def __contains__(self, word):
+        return word.lower() in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+
+def open_store(store_path, clips, size=None):
+    # The store if it exists, matches the library and (if given) the display
+    # size; otherwise None and clips are decoded from their files as before
+    if not store_path or not os.path.exists(store_path):
+        return None
+    try:
+        store = ClipStore(store_path)
+    except (OSError, ValueError) as e:
+        print(f"Could not open clip store {store_path}: {e}")
+        return None
+    if size is not None and store.size != tuple(size):
+        print(f"Clip store {store_path} is {store.size[0]}x{store.size[1]}, display is {size[0]}x{size[1]}; not using it")
+        return None
+    if not store.is_current(clips):
+        print(f"Clip store {store_path} is out of date; rebuild it with clip_store.py")
+        return None
+    return store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transcode the sign library into a memory-mappable raw-frame store.")
+    parser.add_argument("library", nargs="?", default=os.path.join("Research", "Sign library"),
+                        help="folder of clips, or a videos.json word -> path map")
+    parser.add_argument("-o", "--output", default="sign_clips.store")
+    parser.add_argument("--size", type=int, nargs=2, default=list(DEFAULT_SIZE), metavar=("WIDTH", "HEIGHT"),
+                        help="display size of the player canvas")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    clips = library_clips(args.library)
+    print(f"Transcoding {len(clips)} clips to {args.size[0]}x{args.size[1]} with {args.workers} workers...")
+    start = time.perf_counter()
+    index = compile_store(clips, args.output, tuple(args.size), args.workers)
+    frames = sum(entry['count'] for entry in index['clips'].values())
+    size_mb = os.path.getsize(args.output) / (1024 * 1024)
+    print(f"Wrote {len(index['clips'])} clips ({frames} frames, {size_mb:.0f} MB) to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,46 @@
+# frame_pipeline.py
+import cv2
+import numpy as np
+
+
+class FramePipeline:
+    # Converts and resizes frames into buffers that are allocated once and
+    # reused for every frame (OpenCV writes straight into them via dst=).
+    # A buffer is only reallocated when the incoming frame size changes, and
+    # every allocation is counted so the per-frame cost can be checked.
+    def __init__(self):
+        self.buffers = {}
+        self.allocations = 0
+        self.frames = 0
+
+    def _buffer(self, name, shape, dtype=np.uint8):
+        buf = self.buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self.buffers[name] = buf
+            self.allocations += 1
+        return buf
+
+    def to_rgb(self, bgr_frame):
+        # The returned buffer is shared by inference, overlay drawing and
+        # display, and is overwritten by the next call.
+        self.frames += 1
+        rgb = self._buffer('rgb', bgr_frame.shape)
+        cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb
+
+    def resize(self, frame, size, name='resized'):
+        width, height = size
+        out = self._buffer(name, (height, width) + frame.shape[2:], frame.dtype)
+        cv2.resize(frame, (width, height), dst=out, interpolation=cv2.INTER_AREA)
+        return out
+
+    def allocations_per_frame(self):
+        return self.allocations / self.frames if self.frames else 0.0
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'allocations': self.allocations,
+            'allocations_per_frame': self.allocations_per_frame(),
+        }
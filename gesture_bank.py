@@ -0,0 +1,154 @@
+# gesture_bank.py
+import argparse
+import json
+import os
+import struct
+import numpy as np
+
+from hand_frames import normalize_hands
+
+# Bump when the file layout or the template normalization changes
+BANK_VERSION = 1
+MAGIC = b'GBNK'
+HAND_SIZE = 63
+
+# magic, version, one-hand count, two-hand count, source size, source mtime (ns),
+# label table size, templates offset
+HEADER = struct.Struct('<4sIIIQQQQ')
+HEADER_SIZE = 64
+
+
+class GestureBank:
+    # Gesture templates ready for matching: wrist-relative, scale-normalized
+    # float32 rows. When opened from a compiled bank file the template arrays
+    # are read-only np.memmap views, so loading is near-constant time and
+    # processes opening the same file share its pages.
+    def __init__(self, labels, templates, two_hand_labels, two_hand_templates, path=None):
+        self.labels = labels
+        self.templates = templates
+        self.two_hand_labels = two_hand_labels
+        self.two_hand_templates = two_hand_templates
+        self.path = path
+
+    def __len__(self):
+        return len(self.labels) + len(self.two_hand_labels)
+
+
+def _source_signature(json_path):
+    st = os.stat(json_path)
+    return st.st_size, st.st_mtime_ns
+
+
+def bank_from_json(json_path):
+    # Parses gestures.json ({label: [x1, y1, z1, ...]}) into normalized
+    # templates. 63 values is a one-hand pose, 126 a joint two-hand pose.
+    # A label may also map to a list of such poses (several prototypes).
+    with open(json_path, 'r') as f:
+        gestures = json.load(f)
+    one_hand, two_hand = [], []
+    for label, ref_landmarks in gestures.items():
+        several = (ref_landmarks and isinstance(ref_landmarks[0], list)
+                   and len(ref_landmarks[0]) in (HAND_SIZE, 2 * HAND_SIZE))
+        prototypes = ref_landmarks if several else [ref_landmarks]
+        for prototype in prototypes:
+            ref = np.asarray(prototype, dtype=np.float32).reshape(-1)
+            if ref.size == HAND_SIZE:
+                one_hand.append((label, normalize_hands(ref).reshape(-1)))
+            elif ref.size == 2 * HAND_SIZE:
+                two_hand.append((label, normalize_hands(ref).reshape(-1)))
+            else:
+                print(f"Skipping gesture '{label}': expected {HAND_SIZE} or {2 * HAND_SIZE} values, got {ref.size}")
+
+    def stack(entries, size):
+        templates = np.zeros((len(entries), size), dtype=np.float32)
+        for i, (_, ref) in enumerate(entries):
+            templates[i] = ref
+        return [label for label, _ in entries], templates
+
+    labels, templates = stack(one_hand, HAND_SIZE)
+    two_hand_labels, two_hand_templates = stack(two_hand, 2 * HAND_SIZE)
+    return GestureBank(labels, templates, two_hand_labels, two_hand_templates)
+
+
+def compile_bank(json_path, bank_path):
+    bank = bank_from_json(json_path)
+    source_size, source_mtime = _source_signature(json_path)
+    label_table = json.dumps({'labels': bank.labels, 'two_hand_labels': bank.two_hand_labels}).encode('utf-8')
+    # Templates start on a 64-byte boundary after the label table
+    templates_offset = (HEADER_SIZE + len(label_table) + 63) // 64 * 64
+    header = HEADER.pack(MAGIC, BANK_VERSION, len(bank.labels), len(bank.two_hand_labels),
+                         source_size, source_mtime, len(label_table), templates_offset)
+
+    # Write to a temporary file and rename, so readers never see a partial bank
+    tmp_path = bank_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        f.write(label_table)
+        f.write(b'\0' * (templates_offset - HEADER_SIZE - len(label_table)))
+        f.write(bank.templates.tobytes())
+        f.write(bank.two_hand_templates.tobytes())
+    os.replace(tmp_path, bank_path)
+    return bank_path
+
+
+def _read_header(bank_path):
+    with open(bank_path, 'rb') as f:
+        raw = f.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE:
+            return None, None
+        header = HEADER.unpack(raw[:HEADER.size])
+        if header[0] != MAGIC:
+            return None, None
+        label_table = json.loads(f.read(header[6]).decode('utf-8'))
+    return header, label_table
+
+
+def bank_is_current(bank_path, json_path):
+    if not os.path.exists(bank_path):
+        return False
+    header, _ = _read_header(bank_path)
+    if header is None or header[1] != BANK_VERSION:
+        return False
+    if json_path is None or not os.path.exists(json_path):
+        return True
+    return (header[4], header[5]) == _source_signature(json_path)
+
+
+def _memmap(path, offset, rows, size):
+    if rows == 0:
+        return np.zeros((0, size), dtype=np.float32)
+    return np.memmap(path, dtype=np.float32, mode='r', offset=offset, shape=(rows, size))
+
+
+def load_bank(bank_path):
+    header, label_table = _read_header(bank_path)
+    if header is None or header[1] != BANK_VERSION:
+        raise ValueError(f"{bank_path} is not a version {BANK_VERSION} gesture bank")
+    _, _, n_one, n_two, _, _, _, templates_offset = header
+    templates = _memmap(bank_path, templates_offset, n_one, HAND_SIZE)
+    two_hand_templates = _memmap(bank_path, templates_offset + n_one * HAND_SIZE * 4, n_two, 2 * HAND_SIZE)
+    return GestureBank(label_table['labels'], templates, label_table['two_hand_labels'],
+                       two_hand_templates, path=bank_path)
+
+
+def open_bank(bank_path='gestures.bank', json_path='gestures.json'):
+    # Opens the compiled bank, recompiling it first if gestures.json is newer
+    # or the bank was written by another version. If the bank cannot be
+    # written, the templates are built from the JSON in memory instead.
+    if not bank_is_current(bank_path, json_path):
+        try:
+            compile_bank(json_path, bank_path)
+        except OSError as e:
+            print(f"Could not write gesture bank {bank_path}: {e}; using {json_path}")
+            return bank_from_json(json_path)
+    return load_bank(bank_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile gestures.json into a memory-mappable gesture bank.")
+    parser.add_argument("json_path", nargs="?", default="gestures.json")
+    parser.add_argument("bank_path", nargs="?", default="gestures.bank")
+    args = parser.parse_args()
+    compile_bank(args.json_path, args.bank_path)
+    bank = load_bank(args.bank_path)
+    print(f"Wrote {args.bank_path}: {len(bank.labels)} one-hand and {len(bank.two_hand_labels)} two-hand templates")
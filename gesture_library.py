@@ -0,0 +1,105 @@
+# gesture_library.py
+import os
+import threading
+import time
+
+from gesture_bank import open_bank
+from gesture_matcher import GestureMatcher
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class GestureLibrary:
+    # Keeps a GestureMatcher in sync with gestures.json / gestures.bank. A
+    # background thread polls both files and, when either changes, opens the
+    # bank, builds a new matcher (and its IVF index, if enabled) off the
+    # recognition thread, then swaps it in with a single attribute assignment.
+    # Recognition loops read `matcher` once per frame and use that object for
+    # the whole frame, so they never wait for a reload or see a half-built
+    # index. If the new files cannot be loaded the current matcher is kept.
+    def __init__(self, bank_path='gestures.bank', json_path='gestures.json', poll_interval=1.0,
+                 index_lists=None, index_probe=8, use_index=False, **matcher_options):
+        self.bank_path = bank_path
+        self.json_path = json_path
+        self.poll_interval = poll_interval
+        self.use_index = use_index
+        self.index_lists = index_lists
+        self.index_probe = index_probe
+        self.matcher_options = matcher_options
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # Stats
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload_time = 0.0
+        self.last_index_time = 0.0
+
+        self.signature = self._signature()
+        self.matcher = self._build()
+
+    def _signature(self):
+        return _file_signature(self.json_path), _file_signature(self.bank_path)
+
+    def _build(self):
+        start = time.perf_counter()
+        matcher = GestureMatcher(open_bank(self.bank_path, self.json_path), **self.matcher_options)
+        index_start = time.perf_counter()
+        if self.use_index:
+            matcher.build_index(self.index_lists, self.index_probe)
+        self.last_index_time = time.perf_counter() - index_start
+        self.last_reload_time = time.perf_counter() - start
+        # open_bank may have just rewritten the bank; don't reload for that
+        self.signature = self._signature()
+        return matcher
+
+    def start(self):
+        self.thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def _watch_loop(self):
+        while not self.stop_event.wait(self.poll_interval):
+            self.check()
+
+    def check(self):
+        # Reloads if either file changed since the last load; returns True
+        # when a new matcher was swapped in
+        signature = self._signature()
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        try:
+            matcher = self._build()
+        except (OSError, ValueError, KeyError) as e:
+            # Most likely caught the file mid-write; the finished write
+            # changes the signature again and triggers another attempt
+            self.failures += 1
+            print(f"Gesture reload failed, keeping the current gestures: {e}")
+            return False
+        self.matcher = matcher
+        self.reloads += 1
+        print(f"Reloaded {len(matcher)} gestures in {self.last_reload_time * 1000:.0f} ms "
+              f"(index build {self.last_index_time * 1000:.0f} ms)")
+        return True
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def stats(self):
+        return {
+            'gestures': len(self.matcher),
+            'reloads': self.reloads,
+            'failures': self.failures,
+            'last_reload_ms': self.last_reload_time * 1000,
+            'last_index_ms': self.last_index_time * 1000,
+        }
@@ -0,0 +1,147 @@
+# gesture_matcher.py
+import numpy as np
+
+from hand_frames import UNKNOWN, normalize_hands
+from ann_index import IVFIndex, exact_search
+from gesture_prefilter import SignaturePrefilter
+
+HAND_SIZE = 63  # 21 landmarks * (x, y, z)
+
+# Distances are in normalized hand units (wrist to middle knuckle = 1)
+DEFAULT_THRESHOLD = 1.5
+
+
+class GestureMatcher:
+    # Holds every gesture template of a GestureBank in one contiguous float32
+    # matrix and scores all detected hands against all templates in a single
+    # matrix product. Detected hands are normalized the same way as the bank
+    # templates before scoring. The bank's one-hand templates are 63 values;
+    # two-hand templates are 126 values (first hand followed by second hand).
+    #
+    # For very large vocabularies, build_index() puts an approximate IVF
+    # index in front of the one-hand templates; matches then only scan the
+    # templates in the nearest index cells.
+    #
+    # With prefilter on, each hand first gets a finger-state/palm-axis
+    # signature and is only scored against templates in compatible
+    # signature buckets (see gesture_prefilter.py); a palm between two axes
+    # gets the buckets of both. Only a hand with no compatible bucket at all
+    # falls back to the full search: the IVF index if one is built,
+    # otherwise every template. The IVF index is not used for prefiltered
+    # hands. Signatures cost a pass of their own, so the prefilter only pays
+    # off once scanning all templates dominates a match, around tens of
+    # thousands of templates; below that it is slower than the full scan.
+    # Time match() on the real bank before turning it on.
+    def __init__(self, bank, threshold=DEFAULT_THRESHOLD, index=None, prefilter=False,
+                 max_finger_flips=1):
+        self.threshold = threshold
+        self.labels = bank.labels
+        self.templates = bank.templates
+        self.sq_norms = np.einsum('ij,ij->i', self.templates, self.templates)
+        self.index = index
+        self.prefilter = SignaturePrefilter(self.templates, max_finger_flips) if prefilter else None
+        self.two_hand_labels = bank.two_hand_labels
+        self.two_hand_templates = bank.two_hand_templates
+        self.two_hand_sq_norms = np.einsum('ij,ij->i', self.two_hand_templates, self.two_hand_templates)
+
+    @staticmethod
+    def _distances(queries, templates, sq_norms):
+        # ||q - t||^2 = ||q||^2 + ||t||^2 - 2 q.t for every (query, template) pair
+        queries = queries.reshape(-1, templates.shape[1])
+        d2 = np.einsum('ij,ij->i', queries, queries)[:, None] + sq_norms[None, :] - 2.0 * queries @ templates.T
+        return np.sqrt(np.maximum(d2, 0.0, out=d2), out=d2)
+
+    def build_index(self, n_lists=None, n_probe=8):
+        # Higher n_probe means better recall and slower queries
+        self.index = IVFIndex(self.templates, n_lists=n_lists, n_probe=n_probe) if self.labels else None
+        return self.index
+
+    def distances(self, hands):
+        # (hands, 63) raw landmarks -> (hands, n_templates), always exact
+        return self._distances(normalize_hands(hands), self.templates, self.sq_norms)
+
+    def search(self, hands, k=1):
+        # k nearest one-hand templates per hand as (ids, distances) arrays,
+        # closest first; ids are -1 where fewer than k were found
+        queries = normalize_hands(hands).reshape(-1, HAND_SIZE)
+        if self.prefilter is not None:
+            return self._prefiltered_search(queries, k)
+        return self._full_search(queries, k)
+
+    def _full_search(self, queries, k):
+        if self.index is not None:
+            return self.index.search(queries, k)
+        return exact_search(self.templates, self.sq_norms, queries, k)
+
+    def _prefiltered_search(self, queries, k):
+        ids, dists, missed = self.prefilter.search(queries, k)
+        if missed:
+            nearest, best = self._full_search(queries[missed], k)
+            found = nearest.shape[1]
+            ids[missed, :found] = nearest
+            dists[missed, :found] = best
+        return ids, dists
+
+    def match_hands(self, hands):
+        # Nearest template per hand as (label, distance); label is None when
+        # the nearest template is not within the threshold.
+        if not self.labels:
+            return [(None, float('inf'))] * len(np.reshape(hands, (-1, HAND_SIZE)))
+        ids, dists = self.search(hands, 1)
+        results = []
+        for i, d in zip(ids[:, 0], dists[:, 0]):
+            d = float(d)
+            results.append((self.labels[i] if i >= 0 and d < self.threshold else None, d))
+        return results
+
+    def match(self, hand):
+        return self.match_hands(hand)[0]
+
+    def top_k(self, hand, k=5):
+        # k nearest single-hand templates, closest first
+        if not self.labels:
+            return []
+        ids, dists = self.search(hand, k)
+        return [(self.labels[i], float(d)) for i, d in zip(ids[0], dists[0]) if i >= 0]
+
+    def match_two_hands(self, hands):
+        # Joint match of two hands against the two-hand templates, trying
+        # both hand orders since MediaPipe does not keep a fixed order.
+        if not self.two_hand_labels:
+            return None, float('inf')
+        first, second = normalize_hands(hands).reshape(2, HAND_SIZE)
+        pairs = np.stack([np.concatenate([first, second]), np.concatenate([second, first])])
+        dist = self._distances(pairs, self.two_hand_templates, self.two_hand_sq_norms).min(axis=0)
+        i = int(dist.argmin())
+        d = float(dist[i])
+        return (self.two_hand_labels[i] if d < self.threshold else None), d
+
+    def match_frame(self, points):
+        # Labels recognized in one hand frame of shape (hands, 21, 3): a joint
+        # two-hand sign if one matches, otherwise the per-hand matches.
+        hands = np.asarray(points).reshape(-1, HAND_SIZE)
+        if len(hands) == 0:
+            return []
+        if len(hands) == 2:
+            label, _ = self.match_two_hands(hands)
+            if label:
+                return [label]
+        return [label for label, _ in self.match_hands(hands) if label]
+
+    def match_frame_by_hand(self, points, handedness=()):
+        # Same as match_frame, keyed for SignDebouncer: 'both' for the joint
+        # two-hand sign, otherwise one key per hand (its handedness, or its
+        # slot when MediaPipe did not classify it)
+        hands = np.asarray(points).reshape(-1, HAND_SIZE)
+        if len(hands) == 2:
+            label, _ = self.match_two_hands(hands)
+            if label:
+                return {'both': label}
+        observations = {}
+        for i, (label, _) in enumerate(self.match_hands(hands) if len(hands) else ()):
+            side = int(handedness[i]) if i < len(handedness) else UNKNOWN
+            observations[side if side != UNKNOWN else ('slot', i)] = label
+        return observations
+
+    def __len__(self):
+        return len(self.labels) + len(self.two_hand_labels)
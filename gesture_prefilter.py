@@ -0,0 +1,149 @@
+# gesture_prefilter.py
+import numpy as np
+
+from hand_frames import NUM_LANDMARKS
+from ann_index import exact_search
+
+FINGER_TIPS = [4, 8, 12, 16, 20]
+FINGER_PIPS = [3, 6, 10, 14, 18]  # IP joint for the thumb
+# Finger extension is judged from the wrist, except for the thumb, which is
+# judged from the pinky knuckle so a thumb tucked across the palm reads curled
+FINGER_REFS = [17, 0, 0, 0, 0]
+INDEX_MCP, PINKY_MCP = 5, 17
+FINGER_BITS = (1 << np.arange(5)).astype(np.float32)
+# Every landmark a signature reads, gathered in one indexing step: tips,
+# pips, finger refs, then the index knuckle, pinky knuckle and wrist
+SIGNATURE_POINTS = np.array(FINGER_TIPS + FINGER_PIPS + FINGER_REFS + [INDEX_MCP, PINKY_MCP, 0])
+NEXT_AXIS, PREV_AXIS = np.array([1, 2, 0]), np.array([2, 0, 1])
+
+
+def hand_signatures(hands, axis_tolerance=None):
+    # Cheap discrete signature per normalized hand: a 5-bit mask of extended
+    # fingers (thumb = bit 0) plus the axis the palm faces along (0-2, times
+    # 32). Only the axis is used, not its sign, because the palm normal flips
+    # between left and right hands.
+    #
+    # With axis_tolerance, also returns the signature with the palm's second
+    # axis for hands whose normal is nearly as long along it (at least
+    # axis_tolerance times the first), and -1 for the others.
+    # Runs on every detected hand, where numpy's per-call overhead dominates,
+    # so it uses few, plain array operations (np.cross and np.linalg.norm
+    # alone cost more than a full match on a small bank).
+    hands = np.asarray(hands, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    points = hands[:, SIGNATURE_POINTS]
+    refs = points[:, 10:15]
+    tips = points[:, 0:5] - refs
+    pips = points[:, 5:10] - refs
+    mask = ((tips * tips - pips * pips).sum(axis=2) > 0) @ FINGER_BITS
+
+    a = points[:, 15] - points[:, 17]
+    b = points[:, 16] - points[:, 17]
+    normal = np.abs(a[:, NEXT_AXIS] * b[:, PREV_AXIS] - a[:, PREV_AXIS] * b[:, NEXT_AXIS])
+    axis = normal.argmax(axis=1)
+    signatures = (mask + 32 * axis).astype(np.int32)
+    if axis_tolerance is None:
+        return signatures
+    rows = np.arange(len(hands))
+    longest = normal[rows, axis]
+    normal[rows, axis] = -1.0
+    second = normal.argmax(axis=1)
+    close = normal[rows, second] >= axis_tolerance * longest
+    alternates = np.where(close, mask + 32 * second, -1).astype(np.int32)
+    return signatures, alternates
+
+
+class SignaturePrefilter:
+    # Groups templates by hand signature at load time. A query is then scored
+    # only against templates whose palm axis matches and whose finger mask
+    # differs in at most max_finger_flips fingers. A query whose palm sits
+    # near the boundary between two axes (see axis_tolerance) is scored
+    # against the buckets of both.
+    #
+    # The templates are kept sorted by signature, so every bucket is one
+    # contiguous slice. The candidates of a signature are scored in one
+    # matrix product: in place when its buckets are adjacent, otherwise from
+    # one contiguous copy made the first time the signature is seen. Queries
+    # with the same signature are scored together. search() leaves queries
+    # without any compatible bucket to the caller, counted in fallbacks.
+    def __init__(self, templates, max_finger_flips=1, axis_tolerance=0.8):
+        self.n_templates = len(templates)
+        self.max_finger_flips = max_finger_flips
+        self.axis_tolerance = axis_tolerance
+        signatures = hand_signatures(templates) if self.n_templates else np.zeros(0, dtype=np.int32)
+        self.order = np.argsort(signatures, kind='stable')
+        self.templates = np.ascontiguousarray(np.asarray(templates, dtype=np.float32)[self.order])
+        self.sq_norms = np.einsum('ij,ij->i', self.templates, self.templates)
+        keys, starts, counts = np.unique(signatures[self.order], return_index=True, return_counts=True)
+        self.buckets = {int(s): (int(start), int(start + count))
+                        for s, start, count in zip(keys, starts, counts)}
+        self._compatible = {}
+        self.queries = 0
+        self.eliminated = 0
+        self.last_eliminated = 0
+        self.fallbacks = 0
+
+    def _is_compatible(self, a, b):
+        if a // 32 != b // 32:
+            return False
+        return bin((a ^ b) & 31).count('1') <= self.max_finger_flips
+
+    def candidates(self, signature, alternate=-1):
+        # (ids, templates, sq_norms) of the compatible buckets; ids are rows
+        # of the original template matrix
+        key = (int(signature), int(alternate))
+        block = self._compatible.get(key)
+        if block is None:
+            slices = []
+            for s, (start, stop) in sorted(self.buckets.items()):
+                if not (self._is_compatible(key[0], s) or (key[1] >= 0 and self._is_compatible(key[1], s))):
+                    continue
+                if slices and slices[-1][1] == start:
+                    slices[-1] = (slices[-1][0], stop)
+                else:
+                    slices.append((start, stop))
+            if len(slices) == 1:
+                start, stop = slices[0]
+                block = (self.order[start:stop], self.templates[start:stop], self.sq_norms[start:stop])
+            else:
+                rows = np.concatenate([np.arange(start, stop) for start, stop in slices]) if slices else np.zeros(0, dtype=np.intp)
+                block = (self.order[rows], self.templates[rows], self.sq_norms[rows])
+            self._compatible[key] = block
+        return block
+
+    def search(self, queries, k=1):
+        # k nearest templates per (normalized, flattened) query among its
+        # candidates: (ids, distances, rows without candidates), ids being
+        # rows of the original template matrix and -1 where none was found
+        ids = np.full((len(queries), k), -1, dtype=np.intp)
+        dists = np.full((len(queries), k), np.inf, dtype=np.float32)
+        signatures, alternates = hand_signatures(queries, self.axis_tolerance)
+        groups = {}
+        for row, key in enumerate(zip(signatures.tolist(), alternates.tolist())):
+            groups.setdefault(key, []).append(row)
+
+        missed = []
+        for key, rows in groups.items():
+            candidate_ids, templates, sq_norms = self.candidates(*key)
+            self.queries += len(rows)
+            if not len(candidate_ids):
+                # The caller scans these in full: nothing was eliminated
+                self.last_eliminated = 0
+                missed.extend(rows)
+                continue
+            self.last_eliminated = self.n_templates - len(candidate_ids)
+            self.eliminated += self.last_eliminated * len(rows)
+            nearest, best = exact_search(templates, sq_norms, queries[rows], k)
+            found = nearest.shape[1]
+            ids[rows, :found] = candidate_ids[nearest]
+            dists[rows, :found] = best
+        self.fallbacks += len(missed)
+        return ids, dists, missed
+
+    def stats(self):
+        return {
+            'buckets': len(self.buckets),
+            'queries': self.queries,
+            'last_eliminated': self.last_eliminated,
+            'avg_eliminated': self.eliminated / self.queries if self.queries else 0.0,
+            'fallbacks': self.fallbacks,
+        }
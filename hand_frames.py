@@ -0,0 +1,104 @@
+# hand_frames.py
+import time
+from collections import namedtuple
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST, MIDDLE_MCP = 0, 9
+LEFT, RIGHT, UNKNOWN = 0, 1, -1
+
+# Views into a HandFrameRing. points is (hands, 21, 3) float32, handedness is
+# LEFT/RIGHT/UNKNOWN per hand and scores is the handedness confidence. Rows
+# past count are zero. For window() every field gains a leading time axis.
+HandFrame = namedtuple('HandFrame', ['points', 'handedness', 'scores', 'count', 'timestamp'])
+
+
+def fill_hand_points(out, multi_hand_landmarks):
+    # Writes MediaPipe landmarks into a preallocated (max_hands, 21, 3) array
+    # in one pass and returns how many hands were written.
+    hands = list(multi_hand_landmarks)[:out.shape[0]]
+    n = len(hands)
+    if n:
+        out[:n] = np.fromiter(
+            (v for hand in hands for lm in hand.landmark for v in (lm.x, lm.y, lm.z)),
+            dtype=np.float32, count=n * NUM_LANDMARKS * 3
+        ).reshape(n, NUM_LANDMARKS, 3)
+    out[n:] = 0
+    return n
+
+
+def normalize_hands(points):
+    # Makes hand poses comparable regardless of where the hand is and how
+    # close it is to the camera: landmarks become relative to the wrist and
+    # are scaled so the wrist to middle-finger knuckle distance is 1.
+    # Accepts anything reshapeable to (hands, 21, 3) and returns that shape.
+    hands = np.asarray(points, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    relative = hands - hands[:, WRIST:WRIST + 1]
+    scale = np.linalg.norm(relative[:, MIDDLE_MCP], axis=1)
+    scale[scale < 1e-6] = 1.0
+    return relative / scale[:, None, None]
+
+
+class HandFrameRing:
+    # Fixed-capacity history of recent hand frames. Every slot is written
+    # twice (at i and i + capacity) so any window of the last n <= capacity
+    # frames is one contiguous slice, and readers get views instead of copies.
+    # Views stay valid only until their slot is overwritten.
+    def __init__(self, capacity=64, max_hands=2):
+        self.capacity = capacity
+        self.max_hands = max_hands
+        self.points = np.zeros((2 * capacity, max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.handedness = np.full((2 * capacity, max_hands), UNKNOWN, dtype=np.int8)
+        self.scores = np.zeros((2 * capacity, max_hands), dtype=np.float32)
+        self.counts = np.zeros(2 * capacity, dtype=np.int8)
+        self.timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        self.head = 0  # slot the next frame goes into
+        self.size = 0
+
+    def push(self, multi_hand_landmarks, handedness=(), timestamp=None):
+        i = self.head
+        n = fill_hand_points(self.points[i], multi_hand_landmarks)
+        self.handedness[i] = UNKNOWN
+        self.scores[i] = 0
+        for h, classification in enumerate(list(handedness)[:n]):
+            self.handedness[i, h] = LEFT if classification.label == 'Left' else RIGHT
+            self.scores[i, h] = classification.score
+        self.counts[i] = n
+        self.timestamps[i] = time.time() if timestamp is None else timestamp
+
+        # Mirror into the second half
+        j = i + self.capacity
+        self.points[j] = self.points[i]
+        self.handedness[j] = self.handedness[i]
+        self.scores[j] = self.scores[i]
+        self.counts[j] = n
+        self.timestamps[j] = self.timestamps[i]
+
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return self._frame(i)
+
+    def _frame(self, i):
+        n = int(self.counts[i])
+        return HandFrame(self.points[i, :n], self.handedness[i, :n], self.scores[i, :n],
+                         n, self.timestamps[i])
+
+    def latest(self):
+        if not self.size:
+            return None
+        return self._frame((self.head - 1) % self.capacity)
+
+    def window(self, n):
+        # Last n frames, oldest first, as views of shape (n, max_hands, ...)
+        n = min(n, self.size)
+        end = self.head + self.capacity
+        window = slice(end - n, end)
+        return HandFrame(self.points[window], self.handedness[window], self.scores[window],
+                         self.counts[window], self.timestamps[window])
+
+    def clear(self):
+        self.head = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
@@ -0,0 +1,238 @@
+# hand_tracker.py
+import time
+import cv2
+import numpy as np
+
+from landmark_backends import create_backend
+
+
+class HandTracker:
+    # Owns a single long-lived MediaPipe Hands graph so tracking state carries
+    # over between frames instead of re-running palm detection every tick.
+    # The graph comes from a landmark backend (see landmark_backends.py):
+    # 'solutions' is the synchronous mp.solutions.hands graph, 'tasks' the
+    # asynchronous HandLandmarker loaded from model_asset_path. With an
+    # asynchronous backend process() never waits for inference; it sends the
+    # frame and returns the newest result that finished since the last call,
+    # or the previous landmarks until one is in. Results come back in frame
+    # order: one older than a result already returned is dropped.
+    #
+    # With roi_mode on, inference runs only on a padded square box around the
+    # hands (downscaled to roi_max_side if set), and the landmarks are mapped
+    # back to full-frame coordinates. The box stays put, at a fixed size,
+    # while the hands are further than roi_margin (a fraction of its side)
+    # from its edges, so the tracking graph sees the same crop frame after
+    # frame and keeps tracking instead of re-running palm detection; only a
+    # re-centred or resized box, or a full-frame scan, shifts the coordinates
+    # under it (and a large enough shift makes it re-detect). Each call
+    # runs one inference: a crop that loses the hands clears the ROI and the
+    # next frame gets a full-frame scan, as it does every full_scan_interval
+    # frames while fewer than max_num_hands are tracked so new hands can
+    # still be picked up.
+    #
+    # An optional MotionGate skips inference on frames with no significant
+    # motion and returns the previous landmarks instead. An optional
+    # LandmarkFlow runs inference only on keyframes and carries the landmarks
+    # forward with optical flow on the frames in between. A keyframe needs
+    # landmarks for that very frame, which only a synchronous backend gives,
+    # so with an asynchronous one every frame is sent for inference.
+    def __init__(self, max_num_hands=2, model_complexity=1,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 max_input_side=None, roi_mode=False, roi_padding=0.3, roi_max_side=None,
+                 roi_min_side=96, roi_margin=0.1, full_scan_interval=30, motion_gate=None,
+                 landmark_flow=None, backend='solutions', model_asset_path=None):
+        self.backend_name = backend
+        self.model_asset_path = model_asset_path
+        self.max_num_hands = max_num_hands
+        self.model_complexity = model_complexity
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.max_input_side = max_input_side  # downscale full frames above this size
+        self.roi_mode = roi_mode
+        self.backend = self._create_backend()
+        self.last_results = None  # LandmarkResult of the last finished inference
+        self.last_landmarks = []
+        self.frame_number = 0  # frames sent for inference; tags each result
+        self.result_frame = 0  # frame number of last_results
+        self.motion_gate = motion_gate
+        self.landmark_flow = landmark_flow
+
+        # ROI state
+        self.roi_padding = roi_padding
+        self.roi_max_side = roi_max_side
+        self.roi_min_side = roi_min_side
+        self.roi_margin = roi_margin
+        self.full_scan_interval = full_scan_interval
+        self.roi = None  # (x0, y0, x1, y1) in pixels
+        self.frames_since_full_scan = 0
+        self.roi_frames = 0
+        self.full_frames = 0
+
+    def _create_backend(self):
+        return create_backend(
+            self.backend_name,
+            model_asset_path=self.model_asset_path,
+            max_num_hands=self.max_num_hands,
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
+        )
+
+    def configure(self, model_complexity=None, max_num_hands=None, max_input_side=False,
+                  roi_max_side=False):
+        # Changing the model or hand count needs a new graph; tracking
+        # restarts from a full-frame scan afterwards.
+        rebuild = False
+        if model_complexity is not None and model_complexity != self.model_complexity:
+            self.model_complexity = model_complexity
+            rebuild = self.backend.uses_model_complexity
+        if max_num_hands is not None and max_num_hands != self.max_num_hands:
+            self.max_num_hands = max_num_hands
+            rebuild = True
+        # None is a valid side limit (no limit), so False means unchanged
+        if max_input_side is not False:
+            self.max_input_side = max_input_side
+        if roi_max_side is not False:
+            self.roi_max_side = roi_max_side
+        if rebuild:
+            self.close()
+            self.backend = self._create_backend()
+            self.last_results = None
+            self.roi = None
+
+    def process(self, rgb_frame):
+        return self._process(rgb_frame, None)
+
+    def process_bgr(self, bgr_frame):
+        # Same as process() but converts only the pixels that are actually
+        # inferred on, which in ROI mode is just the crop.
+        return self._process(bgr_frame, cv2.COLOR_BGR2RGB)
+
+    def _process(self, frame, conversion):
+        if self.motion_gate is not None and not self.motion_gate.should_infer(frame):
+            return self.last_landmarks
+
+        flow = self.landmark_flow
+        if flow is not None and not flow.keyframe_due():
+            multi_hand_landmarks = flow.propagate(frame)
+            if multi_hand_landmarks is not None:
+                if self.roi_mode:
+                    self._update_roi(frame, multi_hand_landmarks)
+                self.last_landmarks = multi_hand_landmarks
+                return multi_hand_landmarks
+
+        self.last_landmarks = self._track(frame, conversion)
+        if flow is not None and self.result_frame == self.frame_number:
+            flow.set_keyframe(frame, self.last_landmarks)
+        return self.last_landmarks
+
+    def _track(self, frame, conversion):
+        if self.roi_mode and self.roi is not None and not self._full_scan_due():
+            multi_hand_landmarks = self._process_roi(frame, conversion)
+            self.roi_frames += 1
+            self.frames_since_full_scan += 1
+        else:
+            # No ROI yet, tracking lost in the crop, or a periodic full scan
+            multi_hand_landmarks = self._infer(self._prepare(frame, conversion, self.max_input_side))
+            self.full_frames += 1
+            self.frames_since_full_scan = 0
+        if multi_hand_landmarks is None:
+            return self.last_landmarks  # asynchronous backend still busy
+        if self.roi_mode:
+            # No hands clears the ROI, so the next frame is a full scan
+            self._update_roi(frame, multi_hand_landmarks)
+        return multi_hand_landmarks
+
+    def _infer(self, rgb_frame, box=None):
+        # box is the (x0, y0, w, h, frame_w, frame_h) crop the image was cut
+        # from, if any. It travels with the frame along with the frame number,
+        # so results from an asynchronous backend are mapped back with the box
+        # of the frame they belong to. Returns None when an asynchronous
+        # backend has no new result yet.
+        self.frame_number += 1
+        result = self.backend.detect(rgb_frame, time.monotonic() * 1000, (self.frame_number, box))
+        if result is None or result.context[0] <= self.result_frame:
+            return None
+        self.result_frame, box = result.context
+        self.last_results = result
+        if box is not None:
+            self._map_from_crop(result.landmarks, box)
+        return result.landmarks
+
+    def _full_scan_due(self):
+        tracked = len(self.last_results.landmarks) if self.last_results else 0
+        return tracked < self.max_num_hands and self.frames_since_full_scan >= self.full_scan_interval
+
+    def _prepare(self, image, conversion, max_side):
+        # Downscale before converting so the conversion touches fewer pixels.
+        # Landmarks are normalized, so scaling needs no correction afterwards.
+        image_h, image_w = image.shape[:2]
+        if max_side and max(image_w, image_h) > max_side:
+            scale = max_side / max(image_w, image_h)
+            size = (max(1, int(image_w * scale)), max(1, int(image_h * scale)))
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        if conversion is not None:
+            return cv2.cvtColor(image, conversion)
+        return np.ascontiguousarray(image)
+
+    def _process_roi(self, frame, conversion):
+        x0, y0, x1, y1 = self.roi
+        frame_h, frame_w = frame.shape[:2]
+        crop = self._prepare(frame[y0:y1, x0:x1], conversion, self.roi_max_side)
+        return self._infer(crop, (x0, y0, x1 - x0, y1 - y0, frame_w, frame_h))
+
+    def _map_from_crop(self, multi_hand_landmarks, box):
+        # Map crop-normalized landmarks back to full-frame coordinates
+        x0, y0, crop_w, crop_h, frame_w, frame_h = box
+        for hand_landmarks in multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = (x0 + lm.x * crop_w) / frame_w
+                lm.y = (y0 + lm.y * crop_h) / frame_h
+                lm.z = lm.z * crop_w / frame_w
+
+    def _update_roi(self, frame, multi_hand_landmarks):
+        if not multi_hand_landmarks:
+            self.roi = None
+            return
+        frame_h, frame_w = frame.shape[:2]
+        xs = [lm.x for hand in multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in multi_hand_landmarks for lm in hand.landmark]
+        left, right = min(xs) * frame_w, max(xs) * frame_w
+        top, bottom = min(ys) * frame_h, max(ys) * frame_h
+
+        # Square box around the hands so the palm detector sees normal proportions
+        extent = max(right - left, bottom - top)
+        side = max(extent * (1 + 2 * self.roi_padding), self.roi_min_side)
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            current = x1 - x0
+            margin = self.roi_margin * current
+            # Resized only when the hands outgrow it or it is twice too big
+            if extent <= current - 2 * margin and side >= current / 2:
+                if (left >= x0 + margin and right <= x1 - margin and
+                        top >= y0 + margin and bottom <= y1 - margin):
+                    return  # hands well inside: keep the box as it is
+                side = current  # hands near an edge: re-centre, same size
+
+        # Shifted rather than clipped at the frame edges, so it keeps its size
+        side = int(min(side, frame_w, frame_h))
+        cx, cy = (left + right) / 2, (top + bottom) / 2
+        x0 = int(min(max(0, cx - side / 2), frame_w - side))
+        y0 = int(min(max(0, cy - side / 2), frame_h - side))
+        self.roi = (x0, y0, x0 + side, y0 + side) if side > 1 else None
+
+    def handedness(self):
+        if self.last_results is None:
+            return []
+        return list(self.last_results.handedness)
+
+    def close(self):
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
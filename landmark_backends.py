@@ -0,0 +1,195 @@
+# landmark_backends.py
+import argparse
+import threading
+import time
+from collections import namedtuple
+import cv2
+import numpy as np
+import mediapipe as mp
+from mediapipe.framework.formats import classification_pb2, landmark_pb2
+
+# What every backend's detect() returns. landmarks are NormalizedLandmarkList
+# protos and handedness Classification protos, whatever the backend, so the
+# rest of the pipeline (ROI mapping, overlay, HandFrameRing...) is shared.
+# context is the value the caller passed with the frame the result is for.
+LandmarkResult = namedtuple('LandmarkResult', ['landmarks', 'handedness', 'context'])
+
+
+class SolutionsBackend:
+    # Legacy synchronous mp.solutions.hands graph: detect() blocks until the
+    # result for this very frame is ready.
+    asynchronous = False
+    uses_model_complexity = True
+
+    def __init__(self, max_num_hands=2, model_complexity=1,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.hands = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=max_num_hands,
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+        self.submitted = 0
+        self.total_latency = 0.0
+
+    def detect(self, rgb_frame, timestamp_ms, context=None):
+        start = time.perf_counter()
+        # Mark the frame read-only so MediaPipe can use it without copying
+        rgb_frame.flags.writeable = False
+        results = self.hands.process(rgb_frame)
+        rgb_frame.flags.writeable = True
+        self.submitted += 1
+        self.total_latency += time.perf_counter() - start
+        handedness = [h.classification[0] for h in results.multi_handedness or []]
+        return LandmarkResult(results.multi_hand_landmarks or [], handedness, context)
+
+    def stats(self):
+        return {
+            'submitted': self.submitted,
+            'completed': self.submitted,
+            'dropped': 0,
+            'avg_latency_ms': self.total_latency / self.submitted * 1000 if self.submitted else 0.0,
+        }
+
+    def close(self):
+        if self.hands is not None:
+            self.hands.close()
+            self.hands = None
+
+
+class TasksBackend:
+    # MediaPipe Tasks HandLandmarker in LIVE_STREAM mode, loaded from a local
+    # .task model file. detect() only queues the frame and returns at once
+    # with the newest result that finished since the previous call (None if
+    # there is none); results arrive on MediaPipe's thread through the
+    # callback. Frames sent while the graph is busy may be dropped by
+    # MediaPipe, which is counted in stats().
+    asynchronous = True
+    uses_model_complexity = False
+
+    def __init__(self, model_asset_path='hand_landmarker.task', max_num_hands=2,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 min_presence_confidence=0.5):
+        vision = mp.tasks.vision
+        options = vision.HandLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=model_asset_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=max_num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_presence_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._on_result
+        )
+        self.lock = threading.Lock()
+        self.pending = {}  # timestamp -> (context, submit time)
+        self.latest = None
+        self.last_timestamp = -1
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.total_latency = 0.0
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def detect(self, rgb_frame, timestamp_ms, context=None):
+        # Live-stream timestamps must be strictly increasing
+        timestamp_ms = max(int(timestamp_ms), self.last_timestamp + 1)
+        self.last_timestamp = timestamp_ms
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(rgb_frame))
+        with self.lock:
+            self.pending[timestamp_ms] = (context, time.perf_counter())
+            self.submitted += 1
+            result, self.latest = self.latest, None
+        self.landmarker.detect_async(image, timestamp_ms)
+        return result
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        landmarks = []
+        for hand in result.hand_landmarks:
+            landmark_list = landmark_pb2.NormalizedLandmarkList()
+            landmark_list.landmark.extend(
+                landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in hand)
+            landmarks.append(landmark_list)
+        handedness = [classification_pb2.Classification(index=c[0].index, score=c[0].score,
+                                                        label=c[0].category_name)
+                      for c in result.handedness]
+        with self.lock:
+            context, submitted_at = self.pending.pop(timestamp_ms, (None, None))
+            # Older frames still pending were skipped by the graph
+            stale = [t for t in self.pending if t < timestamp_ms]
+            for t in stale:
+                del self.pending[t]
+            self.dropped += len(stale)
+            self.completed += 1
+            if submitted_at is not None:
+                self.total_latency += time.perf_counter() - submitted_at
+            self.latest = LandmarkResult(landmarks, handedness, context)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'dropped': self.dropped,
+                'avg_latency_ms': self.total_latency / self.completed * 1000 if self.completed else 0.0,
+            }
+
+    def close(self):
+        if self.landmarker is not None:
+            self.landmarker.close()
+            self.landmarker = None
+
+
+BACKENDS = {'solutions': SolutionsBackend, 'tasks': TasksBackend}
+
+
+def create_backend(name='solutions', model_asset_path=None, **settings):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown landmark backend {name!r}; choose from {sorted(BACKENDS)}")
+    if name == 'tasks':
+        if model_asset_path:
+            settings['model_asset_path'] = model_asset_path
+        settings.pop('model_complexity', None)
+    return BACKENDS[name](**settings)
+
+
+def benchmark(path, names=('solutions', 'tasks'), model_asset_path=None, max_num_hands=2):
+    # Feeds the same clip to each backend at the clip's frame rate, like a
+    # camera would, and reports how long the capture loop was blocked per
+    # frame and how many results came back.
+    for name in names:
+        cap = cv2.VideoCapture(path)
+        interval = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or 30)
+        backend = create_backend(name, model_asset_path, max_num_hands=max_num_hands)
+        blocked = []
+        start = time.perf_counter()
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            call_start = time.perf_counter()
+            backend.detect(rgb, (call_start - start) * 1000)
+            blocked.append(time.perf_counter() - call_start)
+            time.sleep(max(0.0, start + len(blocked) * interval - time.perf_counter()))
+        cap.release()
+        time.sleep(0.5)  # let the last asynchronous results arrive
+        stats = backend.stats()
+        backend.close()
+        if not blocked:
+            print(f"{path}: no frames")
+            return
+        blocked = np.array(blocked) * 1000
+        print(f"{name:10s} frames={len(blocked)} results={stats['completed']} dropped={stats['dropped']} "
+              f"blocked avg={blocked.mean():.1f} ms p95={np.percentile(blocked, 95):.1f} ms "
+              f"latency avg={stats['avg_latency_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare landmark backends on the same recorded clip.")
+    parser.add_argument("clip")
+    parser.add_argument("--model", default="hand_landmarker.task", help="HandLandmarker .task file")
+    parser.add_argument("--backends", nargs="+", default=["solutions", "tasks"], choices=sorted(BACKENDS))
+    parser.add_argument("--hands", type=int, default=2)
+    args = parser.parse_args()
+    benchmark(args.clip, args.backends, args.model, args.hands)
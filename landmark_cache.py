@@ -0,0 +1,82 @@
+# landmark_cache.py
+import hashlib
+import json
+import os
+import numpy as np
+
+# Bump when the stored arrays change meaning
+CACHE_VERSION = 2
+
+
+def file_digest(path, chunk_size=1 << 20):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class LandmarkCache:
+    # On-disk cache of per-frame landmark arrays for library clips. Entries
+    # are keyed by the clip's content hash plus the extractor settings, so a
+    # renamed clip is still a hit while an edited clip or a settings change is
+    # a miss. Each entry is one compressed .npz file. Content hashes are
+    # remembered per path (with size and mtime), so unchanged clips are not
+    # re-read just to hash them.
+    def __init__(self, cache_dir='.landmark_cache', settings=None):
+        self.cache_dir = cache_dir
+        self.settings = dict(settings or {})
+        settings_blob = json.dumps({'version': CACHE_VERSION, 'settings': self.settings}, sort_keys=True)
+        self.settings_key = hashlib.sha256(settings_blob.encode('utf-8')).hexdigest()[:16]
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.index = self._load_index()
+        self.hits = 0
+        self.misses = 0
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def content_hash(self, path):
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self.index.get(key)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry['sha256']
+        digest = file_digest(path)
+        self.index[key] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}
+        return digest
+
+    def _entry_path(self, path):
+        return os.path.join(self.cache_dir, f"{self.content_hash(path)}-{self.settings_key}.npz")
+
+    def get(self, path):
+        entry_path = self._entry_path(path)
+        if not os.path.exists(entry_path):
+            self.misses += 1
+            return None
+        with np.load(entry_path) as data:
+            self.hits += 1
+            return data['points'], data['counts'], data['handedness']
+
+    def put(self, path, points, counts, handedness):
+        entry_path = self._entry_path(path)
+        tmp_path = entry_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, points=np.asarray(points, dtype=np.float32),
+                                counts=np.asarray(counts, dtype=np.int8),
+                                handedness=np.asarray(handedness, dtype=np.int8))
+        os.replace(tmp_path, entry_path)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
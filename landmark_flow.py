@@ -0,0 +1,99 @@
+# landmark_flow.py
+import cv2
+import numpy as np
+
+
+class LandmarkFlow:
+    # Carries hand landmarks forward between keyframes with sparse
+    # Lucas-Kanade optical flow, so full hand inference only has to run every
+    # keyframe_interval frames. Each step is checked with a forward-backward
+    # flow pass; if too many points drift, propagate() returns None and the
+    # caller should run a fresh keyframe.
+    def __init__(self, keyframe_interval=3, max_fb_error=2.0, min_tracked_fraction=0.8,
+                 win_size=(21, 21), max_level=2):
+        self.keyframe_interval = keyframe_interval
+        self.max_fb_error = max_fb_error  # pixels
+        self.min_tracked_fraction = min_tracked_fraction
+        self.lk_params = dict(
+            winSize=win_size,
+            maxLevel=max_level,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
+        self.prev_gray = None
+        self.points = None  # (hands * 21, 1, 2) float32 pixel coordinates
+        self.hands = []
+        self.frames_since_keyframe = 0
+        self.keyframes = 0
+        self.propagated = 0
+        self.drift_resets = 0
+
+    def _gray(self, frame):
+        if frame.ndim == 2:
+            return frame
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    def keyframe_due(self):
+        return (self.prev_gray is None or not self.hands
+                or self.frames_since_keyframe >= self.keyframe_interval - 1)
+
+    def set_keyframe(self, frame, multi_hand_landmarks):
+        self.keyframes += 1
+        self.frames_since_keyframe = 0
+        self.hands = list(multi_hand_landmarks)
+        if not self.hands:
+            # Nothing to carry forward; keep inferring until a hand shows up
+            self.prev_gray = None
+            self.points = None
+            return
+        frame_h, frame_w = frame.shape[:2]
+        self.prev_gray = self._gray(frame)
+        self.points = np.array(
+            [[lm.x * frame_w, lm.y * frame_h] for hand in self.hands for lm in hand.landmark],
+            dtype=np.float32
+        ).reshape(-1, 1, 2)
+
+    def propagate(self, frame):
+        gray = self._gray(frame)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.points, None, **self.lk_params)
+        back, status_back, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, moved, None, **self.lk_params)
+        fb_error = np.linalg.norm(self.points - back, axis=2).ravel()
+        good = (status.ravel() == 1) & (status_back.ravel() == 1) & (fb_error < self.max_fb_error)
+        if good.mean() < self.min_tracked_fraction:
+            self.drift_resets += 1
+            return None
+
+        old = self.points.reshape(-1, 2)
+        moved = moved.reshape(-1, 2)
+        for i in range(len(self.hands)):
+            hand = slice(i * 21, (i + 1) * 21)
+            hand_good = good[hand]
+            if not hand_good.any():
+                self.drift_resets += 1
+                return None
+            # Points that lost track follow the median motion of their hand
+            shift = np.median(moved[hand][hand_good] - old[hand][hand_good], axis=0)
+            moved[hand][~hand_good] = old[hand][~hand_good] + shift
+
+        frame_h, frame_w = frame.shape[:2]
+        propagated = []
+        for i, hand_landmarks in enumerate(self.hands):
+            new_hand = type(hand_landmarks)()
+            new_hand.CopyFrom(hand_landmarks)
+            for j, lm in enumerate(new_hand.landmark):
+                lm.x = float(moved[i * 21 + j, 0]) / frame_w
+                lm.y = float(moved[i * 21 + j, 1]) / frame_h
+            propagated.append(new_hand)
+
+        self.prev_gray = gray
+        self.points = moved.reshape(-1, 1, 2)
+        self.hands = propagated
+        self.frames_since_keyframe += 1
+        self.propagated += 1
+        return propagated
+
+    def stats(self):
+        return {
+            'keyframes': self.keyframes,
+            'propagated': self.propagated,
+            'drift_resets': self.drift_resets,
+        }
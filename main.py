@@ -1,9 +1,15 @@
 import cv2
-import mediapipe as mp
 import os
 import threading
 import tkinter as tk
 from video import SignVideoPlayer  # Assuming this is in 'video.py'
+from hand_tracker import HandTracker
+from hand_frames import HandFrameRing
+from overlay import LandmarkOverlay
+from motion_gate import MotionGate
+from capture import LatestFrameCapture
+from quality import QualityController
+from sign_debounce import SignDebouncer
 import speech_recognition as sr  # For speech recognition
 
 # Setup Tkinter window and canvas
@@ -17,54 +23,63 @@ canvas.pack()
 video_folder = os.path.join("Research", "Sign library")
 player = SignVideoPlayer(canvas, video_folder)
 
-# Initialize MediaPipe Hands
-mp_drawing = mp.solutions.drawing_utils
-mp_drawing_styles = mp.solutions.drawing_styles
-mp_hands = mp.solutions.hands
+# Landmark overlay (pass enabled=False to skip drawing in production)
+overlay = LandmarkOverlay()
+hand_history = HandFrameRing(capacity=8, max_hands=2)
+# One playback per held sign instead of one per frame
+debouncer = SignDebouncer()
 
-# Open webcam
-cap = cv2.VideoCapture(0)
+# One tracker for the whole session so tracking state is kept between frames
+tracker = HandTracker(
+    model_complexity=0,
+    min_detection_confidence=0.5,
+    min_tracking_confidence=0.5,
+    roi_mode=True,
+    roi_max_side=320,
+    motion_gate=MotionGate()
+)
+# Tunes the tracker and loop pacing at runtime to hold the target latency
+quality = QualityController(tracker, complexity_range=(0, 1))
+
+# Open webcam on its own capture thread
+cap = LatestFrameCapture(0).start()
 if not cap.isOpened():
     print("Cannot open webcam")
     exit()
 
 # Function for detecting signs and triggering videos
 def detect_and_play():
-    success, image = cap.read()
+    # Take the newest frame without waiting; older ones were already dropped
+    success, image = cap.read(timeout=0)
     if not success:
-        print("Failed to capture frame.")
-        root.after(10, detect_and_play)
+        if not cap.isOpened():
+            print("Failed to capture frame.")
+        root.after(quality.delay_ms(), detect_and_play)
         return
 
-    # Hand detection
-    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    with mp_hands.Hands(
-        model_complexity=0,
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5
-    ) as hands:
-        results = hands.process(image_rgb)
+    quality.begin_frame()
+    # Hand detection (only the hand region is converted and inferred on)
+    with quality.stage('inference'):
+        multi_hand_landmarks = tracker.process_bgr(image)
 
-        # Draw hand landmarks
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(
-                    image,
-                    hand_landmarks,
-                    mp_hands.HAND_CONNECTIONS,
-                    mp_drawing_styles.get_default_hand_landmarks_style(),
-                    mp_drawing_styles.get_default_hand_connections_style()
-                )
-            # Placeholder for sign recognition logic
-            recognized_word = "hello"  # Replace with actual recognition logic
-            print(f"Recognized sign: {recognized_word}")
-            # Play video for recognized sign
-            player.play_video(recognized_word)
+    # Draw hand landmarks
+    hand_frame = hand_history.push(multi_hand_landmarks, tracker.handedness())
+    observations = {}
+    if hand_frame.count:
+        overlay.draw(image, hand_frame.points)
+        # Placeholder for sign recognition logic
+        observations['sign'] = "hello"  # Replace with actual recognition logic
+    for recognized_word in debouncer.update(observations):
+        print(f"Recognized sign: {recognized_word}")
+        # Play video for recognized sign
+        player.play_video(recognized_word)
 
     # Show webcam feed in OpenCV window
-    cv2.imshow('Webcam', image)
+    with quality.stage('display'):
+        cv2.imshow('Webcam', image)
+    quality.end_frame()
     # Schedule next detection
-    root.after(10, detect_and_play)
+    root.after(quality.delay_ms(), detect_and_play)
 
 # Function to handle recognized speech input
 def handle_recognized_speech(recognized_text):
@@ -104,4 +119,6 @@ root.mainloop()
 
 # Cleanup after closing window
 cap.release()
+tracker.close()
+player.close()
 cv2.destroyAllWindows()
\ No newline at end of file
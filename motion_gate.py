@@ -0,0 +1,55 @@
+# motion_gate.py
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    # Cheap frame-difference check run before hand inference. Frames are
+    # shrunk to a small grayscale thumbnail and compared against the thumbnail
+    # of the last frame that was actually inferred on, so slow movement still
+    # adds up and eventually triggers inference.
+    def __init__(self, size=(80, 60), pixel_threshold=12, min_changed_fraction=0.002,
+                 max_stale_frames=30):
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_fraction = min_changed_fraction
+        self.max_stale_frames = max_stale_frames  # never reuse a result longer than this
+        self.reference = None
+        self.stale_frames = 0
+        self.hits = 0   # frames where motion was seen and inference ran
+        self.skips = 0  # frames where the previous result was reused
+
+    def _thumbnail(self, frame):
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small.astype(np.int16)
+
+    def should_infer(self, frame):
+        thumb = self._thumbnail(frame)
+        if self.reference is None or self.stale_frames >= self.max_stale_frames:
+            moved = True
+        else:
+            changed = np.count_nonzero(np.abs(thumb - self.reference) > self.pixel_threshold)
+            moved = changed >= self.min_changed_fraction * thumb.size
+
+        if moved:
+            self.reference = thumb
+            self.stale_frames = 0
+            self.hits += 1
+        else:
+            self.stale_frames += 1
+            self.skips += 1
+        return moved
+
+    def reset(self):
+        self.reference = None
+        self.stale_frames = 0
+
+    def stats(self):
+        total = self.hits + self.skips
+        return {
+            'hits': self.hits,
+            'skips': self.skips,
+            'skip_rate': self.skips / total if total else 0.0,
+        }
@@ -0,0 +1,52 @@
+# overlay.py
+import time
+import cv2
+import numpy as np
+import mediapipe as mp
+
+
+class LandmarkOverlay:
+    # Draws hand skeletons straight from (hands, 21, 3) landmark arrays.
+    # HAND_CONNECTIONS is turned into an index array once, so all bones of
+    # all hands go to a single cv2.polylines call. Set enabled=False to skip
+    # drawing entirely (e.g. in production kiosks).
+    def __init__(self, enabled=True, rgb=False, point_color=(0, 0, 255), line_color=(255, 255, 255),
+                 thickness=2, radius=2):
+        self.enabled = enabled
+        # Colours are given as BGR; swap them when drawing on RGB frames
+        self.point_color = point_color[::-1] if rgb else point_color
+        self.line_color = line_color[::-1] if rgb else line_color
+        self.thickness = thickness
+        self.radius = radius
+        self.connections = np.array(sorted(mp.solutions.hands.HAND_CONNECTIONS), dtype=np.intp)
+        self.frames = 0
+        self.last_cost = 0.0
+        self.total_cost = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+
+    def draw(self, image, points):
+        if not self.enabled or len(points) == 0:
+            return image
+        start = time.perf_counter()
+        image_h, image_w = image.shape[:2]
+        pixels = (points[..., :2] * (image_w, image_h)).astype(np.int32)  # (hands, 21, 2)
+
+        # (hands * bones, 2, 2) segments drawn in one call
+        segments = pixels[:, self.connections].reshape(-1, 2, 2)
+        cv2.polylines(image, list(segments), False, self.line_color, self.thickness)
+        for x, y in pixels.reshape(-1, 2).tolist():
+            cv2.circle(image, (x, y), self.radius, self.point_color, -1)
+
+        self.last_cost = time.perf_counter() - start
+        self.total_cost += self.last_cost
+        self.frames += 1
+        return image
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'last_ms': self.last_cost * 1000,
+            'avg_ms': self.total_cost / self.frames * 1000 if self.frames else 0.0,
+        }
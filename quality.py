@@ -0,0 +1,147 @@
+# quality.py
+import os
+import time
+from contextlib import contextmanager
+
+
+class QualityController:
+    # Watches per-frame and per-stage latency plus CPU headroom, and moves the
+    # HandTracker up or down a ladder of quality levels to hold the target
+    # frame latency. Levels go from best to cheapest: lower model complexity
+    # first, then smaller input sizes, then fewer hands. It also works out the
+    # delay the loop should wait before the next frame.
+    #
+    # The input size steps limit max_input_side, or roi_max_side (over
+    # roi_sides) when the tracker runs in roi_mode, since most of its frames
+    # are then crops and max_input_side only applies to full-frame scans.
+    def __init__(self, tracker, target_latency=0.040, target_fps=30,
+                 complexity_range=(0, 1), hands_range=(1, 2), input_sides=(None, 640, 480, 320),
+                 roi_sides=(320, 256, 192), delay_range=(0.001, 0.03), min_headroom=0.15,
+                 window=30, smoothing=0.1):
+        self.tracker = tracker
+        self.target_latency = target_latency
+        self.frame_period = 1.0 / target_fps
+        self.min_delay, self.max_delay = delay_range
+        self.min_headroom = min_headroom
+        self.window = window  # frames between decisions
+        self.smoothing = smoothing
+        if tracker.roi_mode:
+            self.side_setting, sides = 'roi_max_side', roi_sides
+        else:
+            self.side_setting, sides = 'max_input_side', input_sides
+        self.levels = self._build_levels(complexity_range, hands_range, sides)
+        self.level = self._current_level()
+
+        self.latency = None  # smoothed frame latency in seconds
+        self.stage_latency = {}
+        self.headroom = 1.0
+        self.delay = self.max_delay
+        self.changes = []
+        self.frame_start = None
+        self.frames_since_change = 0
+        self.window_wall = time.perf_counter()
+        self.window_cpu = time.process_time()
+
+    def _build_levels(self, complexity_range, hands_range, sides):
+        min_complexity, complexity = complexity_range
+        min_hands, hands = hands_range
+        side = sides[0]
+
+        def level():
+            return {'model_complexity': complexity, 'max_num_hands': hands, self.side_setting: side}
+
+        levels = [level()]
+        while complexity > min_complexity:
+            complexity -= 1
+            levels.append(level())
+        for side in sides[1:]:
+            levels.append(level())
+        while hands > min_hands:
+            hands -= 1
+            levels.append(level())
+        return levels
+
+    def _current_level(self):
+        # Start from the tracker's own settings when they are on the ladder
+        current = {'model_complexity': self.tracker.model_complexity,
+                   'max_num_hands': self.tracker.max_num_hands,
+                   self.side_setting: getattr(self.tracker, self.side_setting)}
+        if current in self.levels:
+            return self.levels.index(current)
+        self.tracker.configure(**self.levels[0])
+        return 0
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._smooth(name, time.perf_counter() - start)
+
+    def _smooth(self, name, seconds):
+        previous = self.stage_latency.get(name)
+        if previous is None:
+            self.stage_latency[name] = seconds
+        else:
+            self.stage_latency[name] = previous + self.smoothing * (seconds - previous)
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        elapsed = time.perf_counter() - self.frame_start
+        self.frame_start = None
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += self.smoothing * (elapsed - self.latency)
+
+        # Wait only for what is left of the frame period
+        self.delay = min(self.max_delay, max(self.min_delay, self.frame_period - elapsed))
+
+        self.frames_since_change += 1
+        if self.frames_since_change >= self.window:
+            self._measure_headroom()
+            self._adjust()
+
+    def _measure_headroom(self):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        busy = (cpu - self.window_cpu) / max(wall - self.window_wall, 1e-6) / (os.cpu_count() or 1)
+        self.headroom = max(0.0, 1.0 - busy)
+        self.window_wall, self.window_cpu = wall, cpu
+
+    def _adjust(self):
+        if self.latency > self.target_latency * 1.15 or self.headroom < self.min_headroom:
+            self._set_level(self.level + 1)
+        elif self.latency < self.target_latency * 0.6 and self.headroom > 2 * self.min_headroom:
+            self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        level = min(max(level, 0), len(self.levels) - 1)
+        self.frames_since_change = 0
+        if level == self.level:
+            return
+        settings = self.levels[level]
+        print(f"Quality level {self.level} -> {level}: {settings} "
+              f"(latency {self.latency * 1000:.1f} ms, CPU headroom {self.headroom:.0%})")
+        self.changes.append((time.time(), self.level, level, settings))
+        self.level = level
+        self.tracker.configure(**settings)
+        # Old measurements belong to the previous settings
+        self.latency = None
+
+    def delay_ms(self):
+        return max(1, int(self.delay * 1000))
+
+    def stats(self):
+        return {
+            'level': self.level,
+            'settings': self.levels[self.level],
+            'latency_ms': (self.latency or 0.0) * 1000,
+            'stage_ms': {name: value * 1000 for name, value in self.stage_latency.items()},
+            'headroom': self.headroom,
+        }
@@ -0,0 +1,150 @@
+# sequence_recognizer.py
+import json
+import time
+import numpy as np
+
+from hand_frames import UNKNOWN, normalize_hands
+
+HAND_SIZE = 63
+INF = float('inf')
+
+
+def resample(sequence, length):
+    # Linear interpolation of a (frames, ...) sequence to a fixed frame count
+    sequence = np.asarray(sequence, dtype=np.float32)
+    positions = np.linspace(0, len(sequence) - 1, length)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, len(sequence) - 1)
+    weight = (positions - lower).reshape((-1,) + (1,) * (sequence.ndim - 1)).astype(np.float32)
+    return sequence[lower] * (1 - weight) + sequence[upper] * weight
+
+
+def envelopes(templates, band):
+    # Running min/max of each template over a +-band window (LB_Keogh envelope)
+    padded = np.pad(templates, ((0, 0), (band, band), (0, 0)), mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * band + 1, axis=1)
+    return windows.min(axis=-1), windows.max(axis=-1)
+
+
+class SequenceRecognizer:
+    # Recognizes movement signs by matching the last few seconds of one hand
+    # against sequence templates with dynamic time warping (Sakoe-Chiba band).
+    # Templates are resampled to `length` frames when loaded. Each query first
+    # gets an LB_Keogh lower bound against every template in one vectorized
+    # pass. Templates are then tried in lower-bound order until the bound
+    # exceeds the best distance so far, and each DTW run stops early once a
+    # whole row is already worse than that distance.
+    #
+    # threshold is the largest accepted RMS per-frame distance, in normalized
+    # hand units. hand (LEFT or RIGHT from hand_frames) fixes which hand
+    # update() follows; by default it follows the side of the first hand in
+    # the newest frame.
+    def __init__(self, sequences, length=30, band=4, threshold=1.5, hand=None):
+        self.length = length
+        self.band = band
+        self.threshold = threshold
+        self.hand = hand
+        self.labels = list(sequences)
+        templates = [resample(normalize_hands(frames).reshape(-1, HAND_SIZE), length)
+                     for frames in sequences.values()]
+        self.templates = np.stack(templates) if templates else np.zeros((0, length, HAND_SIZE), np.float32)
+        self.sq_norms = np.einsum('ntd,ntd->nt', self.templates, self.templates)
+        self.lower, self.upper = envelopes(self.templates, band)
+
+        # Stats
+        self.queries = 0
+        self.pruned = 0
+        self.abandoned = 0
+        self.last_cost = 0.0
+        self.total_cost = 0.0
+
+    @classmethod
+    def from_json(cls, path, **options):
+        # {label: [[x1, y1, z1, ...] per frame, ...], ...}
+        with open(path, 'r') as f:
+            return cls(json.load(f), **options)
+
+    def _dtw(self, cost, best):
+        # Banded DTW over a squared-distance cost matrix; returns INF as soon
+        # as every cell in a row is already worse than best
+        n, band = len(cost), self.band
+        prev = [INF] * (n + 1)
+        prev[0] = 0.0
+        for i in range(1, n + 1):
+            row = cost[i - 1]
+            cur = [INF] * (n + 1)
+            row_min = INF
+            for j in range(max(1, i - band), min(n, i + band) + 1):
+                d = row[j - 1] + min(prev[j], cur[j - 1], prev[j - 1])
+                cur[j] = d
+                if d < row_min:
+                    row_min = d
+            if row_min >= best:
+                return INF
+            prev = cur
+        return prev[n]
+
+    def match(self, window):
+        # window: (frames, 21, 3) or (frames, 63) landmarks of one hand.
+        # Returns (label, rms_distance); label is None above the threshold.
+        start = time.perf_counter()
+        self.queries += 1
+        if not self.labels:
+            return None, INF
+        query = resample(normalize_hands(window).reshape(-1, HAND_SIZE), self.length)
+
+        exceed = np.maximum(query - self.upper, 0) + np.maximum(self.lower - query, 0)
+        bounds = np.einsum('ntd,ntd->n', exceed, exceed)
+        q_sq = np.einsum('td,td->t', query, query)
+
+        best = self.threshold ** 2 * self.length
+        best_label = None
+        order = np.argsort(bounds)
+        for rank, i in enumerate(order):
+            if bounds[i] >= best:
+                self.pruned += len(order) - rank
+                break
+            cost = q_sq[:, None] + self.sq_norms[i][None, :] - 2.0 * query @ self.templates[i].T
+            d = self._dtw(np.maximum(cost, 0).tolist(), best)
+            if d == INF:
+                self.abandoned += 1
+            elif d < best:
+                best, best_label = d, self.labels[i]
+
+        self.last_cost = time.perf_counter() - start
+        self.total_cost += self.last_cost
+        return best_label, (best / self.length) ** 0.5 if best_label is not None else INF
+
+    def update(self, hand_history):
+        # Matches the newest `length` frames of one hand of a HandFrameRing,
+        # as long as that hand was seen in every one of them. MediaPipe does
+        # not keep hands in fixed slots, so the hand is found in each frame by
+        # its handedness. A hand MediaPipe did not classify is only followed
+        # while it is the only hand in every frame.
+        if len(hand_history) < self.length:
+            return None
+        window = hand_history.window(self.length)
+        if (window.count < 1).any():
+            return None
+        side = self.hand if self.hand is not None else int(window.handedness[-1, 0])
+        if side == UNKNOWN:
+            if (window.count > 1).any():
+                return None
+            points = window.points[:, 0]
+        else:
+            present = window.handedness == side
+            if not present.any(axis=1).all():
+                return None
+            points = window.points[np.arange(len(present)), present.argmax(axis=1)]
+        label, _ = self.match(points)
+        return label
+
+    def stats(self):
+        checked = self.queries * len(self.labels)
+        return {
+            'queries': self.queries,
+            'prune_rate': self.pruned / checked if checked else 0.0,
+            'abandoned': self.abandoned,
+            'last_ms': self.last_cost * 1000,
+            'avg_ms': self.total_cost / self.queries * 1000 if self.queries else 0.0,
+        }
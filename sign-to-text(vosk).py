@@ -1,12 +1,20 @@
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
 import threading
 import queue
 import json
-import numpy as np
 import cv2
-import mediapipe as mp
+from hand_tracker import HandTracker
+from motion_gate import MotionGate
+from landmark_flow import LandmarkFlow
+from capture import LatestFrameCapture
+from quality import QualityController
+from hand_frames import HandFrameRing
+from overlay import LandmarkOverlay
+from gesture_library import GestureLibrary
+from sequence_recognizer import SequenceRecognizer
+from sign_debounce import SignDebouncer
+from video import SignVideoPlayer
 from vosk import Model, KaldiRecognizer
 import pyaudio
 from textblob import TextBlob
@@ -14,9 +22,12 @@ import pyttsx3
 import os
 
 # Initialize mediapipe and models
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5)
-mp_drawing = mp.solutions.drawing_utils
+# Add backend='tasks', model_asset_path='hand_landmarker.task' to run the
+# MediaPipe Tasks HandLandmarker asynchronously instead
+tracker = HandTracker(max_num_hands=2, min_detection_confidence=0.5, roi_mode=True, roi_max_side=320,
+                      motion_gate=MotionGate(), landmark_flow=LandmarkFlow(keyframe_interval=3))
+quality = QualityController(tracker)
+overlay = LandmarkOverlay()  # pass enabled=False to skip drawing
 
 model = Model("models/vosk-model-en-us-0.22")
 recognizer = KaldiRecognizer(model, 16000)
@@ -24,8 +35,14 @@ recognizer = KaldiRecognizer(model, 16000)
 voice_queue = queue.Queue()
 sign_queue = queue.Queue()
 
-with open('gestures.json', 'r') as f:
-    gestures = json.load(f)
+# Compiled gesture bank; rebuilt from gestures.json when that changes and
+# swapped in by a background watcher, so gestures can be edited live
+gestures = GestureLibrary('gestures.bank', 'gestures.json').start()
+
+# Movement signs, matched over the recent landmark history (optional file)
+sequence_recognizer = None
+if os.path.exists('sign_sequences.json'):
+    sequence_recognizer = SequenceRecognizer.from_json('sign_sequences.json')
 
 with open('videos.json', 'r') as f:
     video_map = json.load(f)
@@ -65,6 +82,8 @@ class SignTranslatorApp:
         self.video_label.pack()
         self.video_canvas = tk.Canvas(root, width=400, height=300, bg="black")
         self.video_canvas.pack()
+        # Plays from sign_clips.store if built (python clip_store.py videos.json)
+        self.player = SignVideoPlayer(self.video_canvas, video_map=video_map)
 
         # Thread control flags
         self.voice_thread = None
@@ -72,9 +91,10 @@ class SignTranslatorApp:
         self.voice_running = False
         self.sign_running = False
         self.current_text = ""
-
-        # Store reference for video image to prevent garbage collection
-        self.video_img = None
+        # Recent hand frames as (hands, 21, 3) arrays for temporal features
+        self.hand_history = HandFrameRing(capacity=64, max_hands=2)
+        # Turns per-frame matches into one event per held sign
+        self.debouncer = SignDebouncer()
 
     def start_voice_input(self):
         self.voice_running = True
@@ -118,52 +138,45 @@ class SignTranslatorApp:
         self.stop_sign_btn.config(state=tk.DISABLED)
 
     def sign_input_loop(self):
-        cap = cv2.VideoCapture(0)
+        cap = LatestFrameCapture(0).start()
         while self.sign_running and cap.isOpened():
             ret, frame = cap.read()
             if not ret:
                 break
-            # Convert frame for mediapipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = hands.process(rgb_frame)
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                    landmarks = []
-                    for lm in hand_landmarks.landmark:
-                        landmarks.extend([lm.x, lm.y, lm.z])
-                    matched_gesture = self.match_gesture(np.array(landmarks))
-                    if matched_gesture:
-                        self.update_text(f"Sign: {matched_gesture}\n")
-                        self.current_text = matched_gesture
+            quality.begin_frame()
+            # Mediapipe converts only the hand region it infers on
+            with quality.stage('inference'):
+                multi_hand_landmarks = tracker.process_bgr(frame)
+            hand_frame = self.hand_history.push(multi_hand_landmarks, tracker.handedness())
+            observations = {}
+            if hand_frame.count:
+                overlay.draw(frame, hand_frame.points)
+                matcher = gestures.matcher  # one matcher for the whole frame
+                observations = matcher.match_frame_by_hand(hand_frame.points, hand_frame.handedness)
+                if sequence_recognizer is not None:
+                    observations['movement'] = sequence_recognizer.update(self.hand_history)
+            # Frames without hands still count, so released signs can re-fire
+            for matched_sign in self.debouncer.update(observations):
+                self.update_text(f"Sign: {matched_sign}\n")
+                self.current_text = matched_sign
             # Show frame (for debugging)
-            cv2.imshow("Sign Input", frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            with quality.stage('display'):
+                cv2.imshow("Sign Input", frame)
+            quality.end_frame()
+            if cv2.waitKey(quality.delay_ms()) & 0xFF == ord('q'):
                 break
         cap.release()
         cv2.destroyAllWindows()
 
-    def match_gesture(self, detected_landmarks):
-        for gesture, ref_landmarks in gestures.items():
-            ref_array = np.array(ref_landmarks)
-            distance = np.linalg.norm(detected_landmarks - ref_array)
-            if distance < 0.5:
-                return gesture
-        return None
-
     def translate_output(self):
         if not self.current_text:
             return
         # Text-to-Speech
         threading.Thread(target=self.speak_text, args=(self.current_text,), daemon=True).start()
-        # Text-to-Video
-        words = self.current_text.split()
-        for word in words:
-            video_path = video_map.get(word.lower())
-            if video_path and os.path.exists(video_path):
-                self.play_video(video_path)
-            else:
-                self.update_canvas_text(word)
+        # Text-to-Video: queued and played back to back from the Tk event
+        # loop, so the window stays responsive; words without a clip are
+        # shown as captions
+        self.player.play_sentence(self.current_text.split(), captions=True)
 
     def speak_text(self, text):
         tts_engine.say(text)
@@ -173,28 +186,8 @@ class SignTranslatorApp:
         self.root.after(0, lambda: self.text_display.insert(tk.END, message))
         self.root.after(0, lambda: self.text_display.see(tk.END))
 
-    def update_canvas_text(self, text):
-        self.video_canvas.delete("all")
-        self.video_canvas.create_text(200, 150, text=text, font=("Arial", 24), fill="white")
-
-    def play_video(self, path):
-        cap = cv2.VideoCapture(path)
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            frame = cv2.resize(frame, (400, 300))
-            img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_img = Image.fromarray(img)
-            self.video_img = ImageTk.PhotoImage(image=pil_img)
-            # Update canvas image
-            self.video_canvas.delete("all")
-            self.video_canvas.create_image(0, 0, anchor=tk.NW, image=self.video_img)
-            self.root.update()
-            cv2.waitKey(30)
-        cap.release()
-
 if __name__ == "__main__":
     root = tk.Tk()
     app = SignTranslatorApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    app.player.close()
\ No newline at end of file
@@ -0,0 +1,64 @@
+# sign_debounce.py
+from collections import Counter, deque
+
+
+class SignDebouncer:
+    # Turns per-frame recognition results into sign events. Each key (a hand,
+    # a two-hand match, the movement recognizer...) keeps a sliding window of
+    # its recent labels:
+    #   - a label is emitted once when it wins at least enter_votes of the
+    #     window (majority vote),
+    #   - it then stays held, with no further events, until it falls below
+    #     exit_votes (hysteresis), so a held sign or a brief flicker does not
+    #     produce duplicates,
+    #   - only after release can the same or another label be emitted again.
+    def __init__(self, window=8, enter_votes=5, exit_votes=2):
+        self.window = window
+        self.enter_votes = enter_votes
+        self.exit_votes = exit_votes
+        self.history = {}
+        self.held = {}
+        self.detections = 0  # raw per-frame labels seen
+        self.emitted = 0
+
+    def update(self, observations):
+        # observations: {key: label or None} for this frame. Keys seen before
+        # but missing here count as None. Returns the labels to emit now.
+        events = []
+        for key in list(self.history.keys() | observations.keys()):
+            label = observations.get(key)
+            if label is not None:
+                self.detections += 1
+            history = self.history.get(key)
+            if history is None:
+                history = self.history[key] = deque(maxlen=self.window)
+            history.append(label)
+
+            held = self.held.get(key)
+            if held is not None:
+                if history.count(held) >= self.exit_votes:
+                    continue
+                del self.held[key]
+
+            votes = Counter(l for l in history if l is not None)
+            if votes:
+                top, count = votes.most_common(1)[0]
+                if count >= self.enter_votes:
+                    self.held[key] = top
+                    self.emitted += 1
+                    events.append(top)
+            elif key not in self.held:
+                # Nothing left in the window; forget the key
+                del self.history[key]
+        return events
+
+    def reset(self):
+        self.history.clear()
+        self.held.clear()
+
+    def stats(self):
+        return {
+            'detections': self.detections,
+            'emitted': self.emitted,
+            'suppressed': self.detections - self.emitted,
+        }
@@ -0,0 +1,97 @@
+# tk_display.py
+import time
+import tkinter as tk
+import numpy as np
+from PIL import Image, ImageTk
+
+from frame_pipeline import FramePipeline
+
+
+class TkFrameSink:
+    # Shows RGB frames on a canvas image item without allocating per frame:
+    # one PIL image and one PhotoImage of the canvas size are filled in place
+    # (frombytes + paste), and frames of another size are scaled into a
+    # reused FramePipeline buffer. The canvas size is read once and then only
+    # updated from <Configure> events, which is also the only time the
+    # images are reallocated. Must be used from the Tk thread.
+    def __init__(self, canvas, item=None, smoothing=0.1):
+        self.canvas = canvas
+        self.item = item if item is not None else canvas.create_image(0, 0, anchor=tk.NW)
+        self.pipeline = FramePipeline()
+        self.smoothing = smoothing
+        self.size = None
+        self.image = None
+        self.photo = None
+        self.hidden = False
+
+        # Stats
+        self.frames = 0
+        self.allocations = 0
+        self.fps = 0.0
+        self.last_time = None
+
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            # Not mapped yet; go by the requested size until <Configure>
+            self._set_size(canvas.winfo_pixels(canvas.cget('width')), canvas.winfo_pixels(canvas.cget('height')))
+        else:
+            self._set_size(width - self._inset(), height - self._inset())
+        canvas.bind('<Configure>', self._on_configure, add='+')
+
+    def _inset(self):
+        # winfo/<Configure> sizes include the border and focus highlight
+        canvas = self.canvas
+        return 2 * (canvas.winfo_pixels(canvas.cget('borderwidth')) +
+                    canvas.winfo_pixels(canvas.cget('highlightthickness')))
+
+    def _on_configure(self, event):
+        self._set_size(event.width - self._inset(), event.height - self._inset())
+
+    def _set_size(self, width, height):
+        size = (max(1, width), max(1, height))
+        if size == self.size:
+            return
+        self.size = size
+        self.image = Image.new('RGB', size)
+        self.photo = ImageTk.PhotoImage(self.image)
+        self.canvas.itemconfig(self.item, image=self.photo)
+        self.allocations += 2
+
+    def show(self, frame):
+        # frame: (h, w, 3) uint8 RGB; scaled to the canvas if needed
+        if frame.shape[1::-1] != self.size:
+            frame = self.pipeline.resize(frame, self.size, 'display')
+        elif not frame.flags.c_contiguous:
+            frame = np.ascontiguousarray(frame)
+            self.allocations += 1
+        self.image.frombytes(frame)
+        self.photo.paste(self.image)
+        if self.hidden:
+            self.canvas.itemconfig(self.item, state=tk.NORMAL)
+            self.hidden = False
+
+        now = time.perf_counter()
+        if self.last_time is not None and now > self.last_time:
+            self.fps += self.smoothing * (1.0 / (now - self.last_time) - self.fps)
+        self.last_time = now
+        self.frames += 1
+
+    def clear(self):
+        # Hides the image until the next frame
+        if not self.hidden:
+            self.canvas.itemconfig(self.item, state=tk.HIDDEN)
+            self.hidden = True
+        self.last_time = None
+
+    def allocations_per_frame(self):
+        total = self.allocations + self.pipeline.allocations
+        return total / self.frames if self.frames else 0.0
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'fps': self.fps,
+            'size': self.size,
+            'allocations': self.allocations + self.pipeline.allocations,
+            'allocations_per_frame': self.allocations_per_frame(),
+        }
@@ -1,21 +1,113 @@
 # video.py
 import os
 import threading
+import time
+from collections import deque
 import cv2
-from PIL import Image, ImageTk
+import numpy as np
 import tkinter as tk
 
+from clip_cache import ClipCache, DecodedClip, clip_fps, decode_clip, display_frames
+from clip_store import open_store
+from tk_display import TkFrameSink
+
+
+class ClipDecoder(threading.Thread):
+    # Decodes one clip to display-ready frames in the background. frames
+    # grows as decoding goes; playback reads it from the Tk thread. A fully
+    # decoded clip is handed to the cache unless playback was cancelled.
+    def __init__(self, video_path, size, cache, key):
+        super().__init__(daemon=True)
+        self.video_path = video_path
+        self.size = size
+        self.cache = cache
+        self.key = key
+        self.frames = []
+        self.fps = 30.0
+        self.finished = False
+        self.cancelled = threading.Event()
+
+    def run(self):
+        cap = cv2.VideoCapture(self.video_path)
+        self.fps = clip_fps(cap)
+        for frame in display_frames(cap, self.size):
+            if self.cancelled.is_set():
+                break
+            self.frames.append(frame)
+        cap.release()
+        if self.frames and not self.cancelled.is_set():
+            self.cache.put(self.key, DecodedClip(np.stack(self.frames), self.fps))
+        self.finished = True
+
+
+class Playback:
+    # State of the clip on screen. The clock starts at the first shown frame;
+    # frame i is due at start + i / fps.
+    def __init__(self, frames, fps, decoder=None):
+        self.frames = frames
+        self.fps = fps
+        self.decoder = decoder
+        self.start = None
+        self.shown = -1
+
+    def finished(self):
+        return self.decoder is None or self.decoder.finished
+
+
 class SignVideoPlayer:
-    def __init__(self, canvas, folder_path):
+    # Decoded clips are kept in a ClipCache at canvas size, so a word played
+    # again starts without opening or decoding the file. The first play of a
+    # word fills the cache as it goes. The preload most played words (counted
+    # in usage_path across sessions) are decoded in the background at startup.
+    #
+    # If store_path is a current clip store (see clip_store.py) built at the
+    # canvas size, clips are played straight from its memory-mapped frames
+    # and nothing is decoded at all.
+    #
+    # Frames are shown from the Tk event loop with after(), so play_video and
+    # stop_video must be called from the Tk thread. Each tick shows the frame
+    # due at the current time for the clip's fps, skipping frames that are
+    # already late, and schedules itself for the next frame's deadline.
+    # Stopping or switching clips cancels the pending tick; nothing waits.
+    #
+    # play_sentence() queues several words. While one clip plays the next is
+    # decoded in the background, and it starts on the tick the current clip
+    # ends, so a sentence plays as one continuous stream.
+    #
+    # Clips come from the files in folder_path, or from a word -> path
+    # video_map (like videos.json) when one is given.
+    def __init__(self, canvas, folder_path=None, cache_budget_mb=256, preload=8,
+                 usage_path='clip_usage.json', store_path='sign_clips.store',
+                 video_map=None, caption_time=0.8):
         self.canvas = canvas
         self.folder_path = folder_path
-        self.video_dict = self.load_videos()
-        self.stop_event = threading.Event()
-        self.current_thread = None
+        if video_map is not None:
+            self.video_dict = {word.lower(): path for word, path in video_map.items()}
+        else:
+            self.video_dict = self.load_videos()
+        self.caption_time = caption_time
+        self.playback = None
+        self.after_id = None
+        self.queue = deque()
+        self.captions = False
+        self.caption_shown = False
+        self.prefetched = None  # (cache key, ClipDecoder) of the next clip
+        self.cache = ClipCache(cache_budget_mb * 1024 * 1024, usage_path)
+
+        # Stats
+        self.frames_shown = 0
+        self.frames_dropped = 0
 
         # Create a single image item on the canvas
         self.image_on_canvas = self.canvas.create_image(0, 0, anchor=tk.NW)
         self.canvas.update()  # Ensure the canvas is updated
+        # Pastes frames into one canvas-sized image; tracks the canvas size
+        self.sink = TkFrameSink(self.canvas, self.image_on_canvas)
+
+        self.store = open_store(store_path, self.video_dict, self.display_size())
+        if preload and self.store is None:
+            words = self.cache.most_frequent(preload)
+            threading.Thread(target=self.preload, args=(words, self.display_size()), daemon=True).start()
 
     def load_videos(self):
         videos = {}
@@ -26,44 +118,180 @@ class SignVideoPlayer:
         return videos
 
     def get_video_path(self, word):
-        return self.video_dict.get(word.lower(), None)
+        video_path = self.video_dict.get(word.lower(), None)
+        return video_path if video_path and os.path.exists(video_path) else None
+
+    def display_size(self):
+        return self.sink.size
+
+    def preload(self, words, size):
+        for word in words:
+            video_path = self.get_video_path(word)
+            key = (word.lower(),) + size
+            if video_path and key not in self.cache:
+                clip = decode_clip(video_path, size)
+                if clip is not None:
+                    self.cache.put(key, clip)
 
     def play_video(self, word):
-        # Stop any currently playing video
+        # Stops any currently playing video
+        self.play_sentence([word])
+
+    def play_sentence(self, words, captions=False):
+        # Words without a clip are shown as a caption for caption_time
+        # seconds if captions is set, otherwise skipped
         self.stop_video()
+        self.queue.extend(words)
+        self.captions = captions
+        self._start_next()
+
+    def _stored_clip(self, word, size):
+        if self.store is not None and self.store.size == size:
+            return self.store.get(word)
+        return None
 
+    def _load(self, word):
+        # Playback for a word from the store, the cache, the prefetch or a
+        # new background decode; None if the word has no clip
         video_path = self.get_video_path(word)
         if not video_path:
+            return None
+        size = self.display_size()
+        key = (word.lower(),) + size
+        clip = self._stored_clip(word, size)
+        if clip is None:
+            clip = self.cache.get(key)
+        if clip is not None:
+            return Playback(clip.frames, clip.fps)
+
+        if self.prefetched is not None and self.prefetched[0] == key:
+            decoder = self.prefetched[1]
+            self.prefetched = None
+        else:
+            # The same word again replays the frames the current clip's
+            # decoder has (or is still) producing
+            decoder = self._decoding(key)
+            if decoder is None:
+                # Decode in the background and play frames as they arrive
+                decoder = ClipDecoder(video_path, size, self.cache, key)
+                decoder.start()
+        return Playback(decoder.frames, None, decoder)
+
+    def _decoding(self, key):
+        # Decoder of the clip on screen if it is decoding key, else None
+        decoder = self.playback.decoder if self.playback is not None else None
+        if decoder is not None and decoder.key == key and not decoder.cancelled.is_set():
+            return decoder
+        return None
+
+    def _prefetch(self):
+        # Starts decoding the next queued clip unless it is ready already
+        if not self.queue:
+            return
+        word = self.queue[0]
+        video_path = self.get_video_path(word)
+        size = self.display_size()
+        key = (word.lower(),) + size
+        if self.prefetched is not None:
+            if self.prefetched[0] == key:
+                return
+            self.prefetched[1].cancelled.set()
+            self.prefetched = None
+        if not video_path or key in self.cache or self._stored_clip(word, size) is not None:
+            return
+        if self._decoding(key) is not None:
+            return  # a repeated word reuses the current decoder's frames
+        decoder = ClipDecoder(video_path, size, self.cache, key)
+        decoder.start()
+        self.prefetched = (key, decoder)
+
+    def _start_next(self):
+        while self.queue:
+            word = self.queue.popleft()
+            playback = self._load(word)
+            if playback is not None:
+                self.cache.record_play(word.lower())
+                self.playback = playback
+                self._prefetch()
+                self._tick(playback)
+                return
+            if self.captions:
+                # An empty, finished playback: its tick moves on to the next word
+                self.playback = playback = Playback([], None)
+                self._show_caption(word)
+                self._prefetch()
+                self.after_id = self.canvas.after(int(self.caption_time * 1000), self._tick, playback)
+                return
             print(f"No video found for '{word}'")
+        self.playback = None
+
+    def _show_caption(self, text):
+        self.sink.clear()
+        self.canvas.delete('caption')
+        width, height = self.sink.size
+        self.canvas.create_text(width // 2, height // 2, text=text, font=("Arial", 24),
+                                fill="white", tags='caption')
+        self.caption_shown = True
+
+    def _tick(self, playback):
+        self.after_id = None
+        if playback is not self.playback:
+            return  # stopped or replaced
+        available = len(playback.frames)
+        if available == 0:
+            if playback.finished():
+                self._start_next()
+            else:
+                self.after_id = self.canvas.after(5, self._tick, playback)
             return
 
-        self.stop_event.clear()
-
-        def stream_video():
-            cap = cv2.VideoCapture(video_path)
-            while cap.isOpened() and not self.stop_event.is_set():
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                # Convert BGR to RGB
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                # Resize to fit canvas
-                frame = cv2.resize(frame, (self.canvas.winfo_width(), self.canvas.winfo_height()))
-                # Convert to PhotoImage
-                img = Image.fromarray(frame)
-                photo = ImageTk.PhotoImage(image=img)
-                # Update existing image item
-                self.canvas.itemconfig(self.image_on_canvas, image=photo)
-                self.canvas.image = photo  # keep reference
-                self.canvas.update()
-                # Delay to control frame rate
-                cv2.waitKey(30)
-            cap.release()
-
-        self.current_thread = threading.Thread(target=stream_video, daemon=True)
-        self.current_thread.start()
+        now = time.perf_counter()
+        if playback.start is None:
+            playback.start = now
+            playback.fps = playback.fps or playback.decoder.fps
+        index = int((now - playback.start) * playback.fps)
+        behind = index >= available
+        if behind:
+            if playback.finished():
+                # Next clip starts on this tick, right when this one ends
+                self._start_next()
+                return
+            index = available - 1  # decoder is behind; show its newest frame
+
+        if index != playback.shown:
+            self.frames_dropped += max(0, index - playback.shown - 1)
+            self.frames_shown += 1
+            playback.shown = index
+            if self.caption_shown:
+                self.canvas.delete('caption')
+                self.caption_shown = False
+            self.sink.show(playback.frames[index])
+
+        next_due = playback.start + (index + 1) / playback.fps
+        delay = max(5 if behind else 1, int((next_due - time.perf_counter()) * 1000))
+        self.after_id = self.canvas.after(delay, self._tick, playback)
 
     def stop_video(self):
-        self.stop_event.set()
-        if self.current_thread and self.current_thread.is_alive():
-            self.current_thread.join()
\ No newline at end of file
+        # Stops the clip and drops the rest of the sentence
+        playback, self.playback = self.playback, None
+        self.queue.clear()
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        if playback is not None and playback.decoder is not None:
+            playback.decoder.cancelled.set()
+        if self.prefetched is not None:
+            self.prefetched[1].cancelled.set()
+            self.prefetched = None
+
+    def close(self):
+        # Saves the clip play counts; call once the app is closing
+        self.cache.close()
+
+    def stats(self):
+        return {
+            'frames_shown': self.frames_shown,
+            'frames_dropped': self.frames_dropped,
+            'display': self.sink.stats(),
+            'cache': self.cache.stats(),
+        }
@@ -0,0 +1,194 @@
+# vision_worker.py
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+
+from capture import LatestFrameCapture
+from hand_frames import NUM_LANDMARKS, fill_hand_points
+from hand_tracker import HandTracker
+from sign_debounce import SignDebouncer
+
+
+def _aligned(offset, alignment=64):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class SharedFrameRing:
+    # Fixed-size ring of camera frames and landmark arrays in one
+    # multiprocessing.shared_memory block. Every field is a NumPy view onto the
+    # block, so both processes read and write the same pages without copying.
+    # seqs[slot] holds the sequence number of the frame in that slot, or -1
+    # while the slot is being rewritten.
+    def __init__(self, slots, width, height, max_hands=2, name=None):
+        self.slots = slots
+        self.width = width
+        self.height = height
+        self.max_hands = max_hands
+
+        layout = [
+            ('seqs', (slots,), np.int64),
+            ('counts', (slots,), np.int32),
+            ('landmarks', (slots, max_hands, NUM_LANDMARKS, 3), np.float32),
+            ('frames', (slots, height, width, 3), np.uint8),
+        ]
+        offsets = []
+        size = 0
+        for _, shape, dtype in layout:
+            size = _aligned(size)
+            offsets.append(size)
+            size += int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        for (field, shape, dtype), offset in zip(layout, offsets):
+            setattr(self, field, np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset))
+        if self.owner:
+            self.seqs[:] = -1
+            self.counts[:] = 0
+
+    def spec(self):
+        # Everything another process needs to attach to this ring
+        return dict(slots=self.slots, width=self.width, height=self.height,
+                    max_hands=self.max_hands, name=self.shm.name)
+
+    def close(self):
+        # Views must be dropped before the block can be closed
+        self.seqs = self.counts = self.landmarks = self.frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A caller still holds a view; the mapping goes away with it
+            pass
+        if self.owner:
+            self.shm.unlink()
+
+
+def _worker_main(spec, source, tracker_options, latest, stop_event, events, recognize):
+    # Runs in the worker process: capture, hand inference and (optionally)
+    # recognition. Only small event dicts go back through the events queue.
+    ring = SharedFrameRing(**spec)
+    tracker = HandTracker(**tracker_options)
+    cap = LatestFrameCapture(source).start()
+    debouncer = SignDebouncer()
+    seq = 0
+    try:
+        while not stop_event.is_set():
+            ret, frame = cap.read(timeout=1.0)
+            if not ret:
+                if cap.isOpened():
+                    continue
+                events.put({'type': 'stopped'})
+                break
+
+            seq += 1
+            slot = seq % ring.slots
+            ring.seqs[slot] = -1  # readers of this slot will see it as stale
+            slot_frame = ring.frames[slot]
+            if frame.shape[:2] == slot_frame.shape[:2]:
+                slot_frame[...] = frame
+            else:
+                cv2.resize(frame, (ring.width, ring.height), dst=slot_frame, interpolation=cv2.INTER_AREA)
+
+            multi_hand_landmarks = tracker.process_bgr(slot_frame)
+            count = fill_hand_points(ring.landmarks[slot], multi_hand_landmarks)
+            ring.counts[slot] = count
+            ring.seqs[slot] = seq
+            latest.value = seq
+
+            if recognize is not None:
+                observations = {hand: recognize(ring.landmarks[slot, hand].reshape(-1))
+                                for hand in range(count)}
+                # Only sign onsets are posted, not every frame a sign is held
+                for label in debouncer.update(observations):
+                    try:
+                        events.put_nowait({'type': 'sign', 'label': label,
+                                           'seq': seq, 'time': time.time()})
+                    except queue.Full:
+                        pass
+    finally:
+        cap.release()
+        tracker.close()
+        ring.close()
+
+
+class VisionWorker:
+    # Optional mode that moves capture and hand inference into a separate
+    # process. The UI process reads frames and landmarks from the shared ring
+    # as zero-copy views and receives recognition events from a queue.
+    #
+    # recognize, if given, must be a picklable top-level function taking a
+    # flat 63-value landmark vector and returning a label or None.
+    def __init__(self, source=0, width=640, height=480, slots=4, max_hands=2,
+                 tracker_options=None, recognize=None):
+        self.source = source
+        self.width = width
+        self.height = height
+        self.slots = slots
+        self.max_hands = max_hands
+        self.tracker_options = dict(tracker_options or {}, max_num_hands=max_hands)
+        self.recognize = recognize
+        self.ring = None
+        self.process = None
+        self.frames_read = 0
+        self.frames_torn = 0  # frames overwritten while the UI was reading them
+
+    def start(self):
+        # spawn keeps the child free of the parent's Tk and camera state
+        ctx = multiprocessing.get_context('spawn')
+        self.ring = SharedFrameRing(self.slots, self.width, self.height, self.max_hands)
+        self.latest = ctx.Value('q', 0)
+        self.stop_event = ctx.Event()
+        self.events = ctx.Queue(maxsize=256)
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(self.ring.spec(), self.source, self.tracker_options,
+                  self.latest, self.stop_event, self.events, self.recognize),
+            daemon=True
+        )
+        self.process.start()
+        return self
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def read_latest(self, last_seq=0):
+        # Returns (seq, frame, landmarks) views for the newest frame after
+        # last_seq, or None. Views are only valid until the worker reuses the
+        # slot, so copy what you need and then check still_valid(seq).
+        seq = self.latest.value
+        if seq <= last_seq:
+            return None
+        slot = seq % self.slots
+        count = int(self.ring.counts[slot])
+        return seq, self.ring.frames[slot], self.ring.landmarks[slot, :count]
+
+    def still_valid(self, seq):
+        valid = self.ring.seqs[seq % self.slots] == seq
+        self.frames_read += 1
+        if not valid:
+            self.frames_torn += 1
+        return valid
+
+    def poll_events(self):
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def stop(self):
+        if self.process is None:
+            return
+        self.stop_event.set()
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        self.ring.close()